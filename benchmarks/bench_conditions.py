@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Backends de evaluación de condiciones
+
+Compara el visitante AST (SafeConditionEvaluator) con el backend de closures
+precompiladas usando las reglas reales del plugin informe_auditoria, y
+verifica que ambos producen exactamente los mismos resultados.
+
+Uso:
+    python benchmarks/bench_conditions.py [--contextos 500] [--repeticiones 5]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from report_platform.core.config_loader import (
+    load_conditional_variables,
+    load_text_blocks,
+)
+from report_platform.core.conditions_engine import (
+    BACKEND_CLOSURE,
+    BACKEND_VISITOR,
+    CompiledCondition,
+)
+
+PLUGIN_DIR = PROJECT_ROOT / "report_platform" / "reports" / "informe_auditoria"
+CONFIG_DIR = PLUGIN_DIR / "config"
+
+
+def build_contexts(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Genera contextos aleatorios a partir de las opciones de las variables condicionales."""
+    rnd = random.Random(seed)
+    variables = load_conditional_variables(CONFIG_DIR)
+    domains = {v.id: [opt.valor for opt in v.opciones or []] for v in variables}
+
+    contexts = []
+    for _ in range(n):
+        context = {var_id: rnd.choice(values) for var_id, values in domains.items() if values}
+        contexts.append(context)
+    return contexts
+
+
+def run_backend(conditions: List[CompiledCondition],
+                contexts: List[Dict[str, Any]]) -> List[bool]:
+    """Evalúa todas las condiciones en todos los contextos."""
+    return [cond.evaluate(ctx) for ctx in contexts for cond in conditions]
+
+
+def time_backend(conditions: List[CompiledCondition], contexts: List[Dict[str, Any]],
+                 repeats: int) -> float:
+    """Devuelve el mejor tiempo (segundos) de varias repeticiones."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run_backend(conditions, contexts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contextos", type=int, default=500)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    # Las variables ausentes generan warnings; no interesan en el benchmark
+    logging.getLogger("report_platform").setLevel(logging.ERROR)
+    logging.getLogger("report_platform.core.conditions_engine").setLevel(logging.ERROR)
+
+    sources = [rule.cuando for block in load_text_blocks(CONFIG_DIR) for rule in block.reglas]
+    contexts = build_contexts(args.contextos)
+
+    visitor = [CompiledCondition(src, BACKEND_VISITOR) for src in sources]
+    closure = [CompiledCondition(src, BACKEND_CLOSURE) for src in sources]
+
+    print("=" * 70)
+    print("BENCHMARK DE BACKENDS DE CONDICIONES")
+    print("=" * 70)
+    print(f"Reglas: {len(sources)} | Contextos: {len(contexts)} | "
+          f"Evaluaciones por pasada: {len(sources) * len(contexts)}")
+
+    if run_backend(visitor, contexts) != run_backend(closure, contexts):
+        print("❌ Los backends producen resultados distintos")
+        return 1
+    print("✅ Resultados idénticos en ambos backends")
+
+    t_visitor = time_backend(visitor, contexts, args.repeticiones)
+    t_closure = time_backend(closure, contexts, args.repeticiones)
+
+    print(f"\nvisitor: {t_visitor * 1000:8.1f} ms")
+    print(f"closure: {t_closure * 1000:8.1f} ms")
+    print(f"Aceleración: x{t_visitor / t_closure:.2f}")
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Tiempo de importación de los módulos de la plataforma
+
+Importa cada módulo en un intérprete nuevo con ``python -X importtime`` y
+muestra el tiempo acumulado de la importación y las dependencias que más
+pesan. Sirve para comprobar que los usos sin interfaz (lotes, CLI) no pagan
+la importación de Streamlit, Jinja2 o docxtpl.
+
+Uso:
+    python benchmarks/bench_import_time.py [--top 8] [modulo ...]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+DEFAULT_MODULES = [
+    "report_platform",
+    "report_platform.core.utils",
+    "report_platform.core.conditions_engine",
+    "report_platform.core.config_loader",
+    "report_platform.core.word_engine",
+    "report_platform.core.metadata",
+    "report_platform.batch",
+]
+
+# Dependencias pesadas que no deberían importarse sin usarse
+HEAVY_MODULES = ("streamlit", "docxtpl", "docx", "jinja2")
+
+
+def import_profile(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Importa un módulo con -X importtime en un subproceso.
+
+    Returns:
+        Lista de (módulo, microsegundos propios, microsegundos acumulados)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=8, help="Dependencias más lentas a mostrar")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BENCHMARK DE TIEMPO DE IMPORTACIÓN")
+    print("=" * 70)
+
+    for module in args.modules:
+        try:
+            rows = import_profile(module)
+        except RuntimeError as e:
+            print(f"❌ {module}: {e}")
+            continue
+
+        total_ms = next(cum for name, _, cum in reversed(rows) if name == module) / 1000
+        heavy = sorted({name.split('.')[0] for name, _, _ in rows} & set(HEAVY_MODULES))
+        print(f"\n{module}: {total_ms:.1f} ms"
+              + (f"  (importa: {', '.join(heavy)})" if heavy else ""))
+
+        top_level = {}
+        for name, _, cumulative in rows:
+            package = name.split('.')[0]
+            if package != module.split('.')[0]:
+                top_level[package] = max(top_level.get(package, 0), cumulative)
+        for package, cumulative in sorted(top_level.items(), key=lambda x: -x[1])[:args.top]:
+            print(f"    {package:28s} {cumulative / 1000:7.1f} ms")
+
+    print("\n" + "=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Escrituras concurrentes de metadatos
+
+Lanza N procesos que guardan registros de metadata a la vez (y, opcionalmente,
+borran y compactan) sobre un directorio temporal, y comprueba al final que no
+se ha perdido ni duplicado ningún registro. Se ejecuta con cada backend.
+
+Uso:
+    python benchmarks/bench_metadata_concurrency.py [--procesos 8] [--registros 200]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from report_platform.core import metadata as meta_module
+from report_platform.core.metadata import (
+    BACKEND_ENV_VAR,
+    BACKEND_JSONL,
+    BACKEND_SQLITE,
+    METADATA_DIR_ENV_VAR,
+    ReportMetadata,
+    compact_metadata,
+    delete_metadata_by_id,
+    load_all_metadata,
+    save_metadata,
+)
+
+
+def writer(worker: int, n_records: int, delete_every: int) -> Tuple[List[str], List[str]]:
+    """
+    Guarda ``n_records`` registros y borra uno de cada ``delete_every``.
+
+    Returns:
+        (ids que deben existir, ids borrados)
+    """
+    logging.getLogger("report_platform").setLevel(logging.ERROR)
+    meta_module.logger.setLevel(logging.ERROR)
+
+    kept, deleted = [], []
+    for i in range(n_records):
+        record_id = f"w{worker:02d}_{i:05d}"
+        save_metadata(ReportMetadata(
+            id=record_id,
+            report_id=f"informe_{worker % 3}",
+            report_name="Benchmark",
+            timestamp=f"2024-01-01T00:00:00.{worker:02d}{i:04d}",
+            template_version="1.0.0",
+            input_data={'worker': worker, 'i': i},
+            output_path=f"/tmp/{record_id}.docx",
+            output_filename=f"{record_id}.docx",
+        ))
+
+        if delete_every and i % delete_every == 0:
+            if not delete_metadata_by_id(record_id):
+                raise RuntimeError(f"No se pudo borrar {record_id}")
+            deleted.append(record_id)
+        else:
+            kept.append(record_id)
+
+        # Un worker compacta de vez en cuando para cruzarse con las escrituras
+        if worker == 0 and i % 50 == 49:
+            compact_metadata()
+
+    return kept, deleted
+
+
+def run(backend: str, processes: int, n_records: int, delete_every: int) -> bool:
+    """Ejecuta la prueba con un backend y devuelve True si no hay pérdidas."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ[METADATA_DIR_ENV_VAR] = tmp_dir
+        os.environ[BACKEND_ENV_VAR] = backend
+
+        start = time.perf_counter()
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(writer, [(w, n_records, delete_every) for w in range(processes)])
+        elapsed = time.perf_counter() - start
+
+        expected = {record_id for kept, _ in results for record_id in kept}
+        stored = [m.id for m in load_all_metadata()]
+
+        lost = expected - set(stored)
+        resurrected = set(stored) - expected
+        duplicated = len(stored) - len(set(stored))
+        writes = sum(len(kept) + 2 * len(deleted) for kept, deleted in results)
+
+        ok = not lost and not resurrected and not duplicated
+        print(f"{backend:>6}: {len(stored):6d}/{len(expected)} registros | "
+              f"perdidos {len(lost)} | reaparecidos {len(resurrected)} | "
+              f"duplicados {duplicated} | {writes / elapsed:8.0f} escrituras/s "
+              f"{'✅' if ok else '❌'}")
+        return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--procesos", type=int, default=8)
+    parser.add_argument("--registros", type=int, default=200, help="Registros por proceso")
+    parser.add_argument("--borrar-cada", type=int, default=10,
+                        help="Borrar uno de cada N registros (0 = no borrar)")
+    args = parser.parse_args()
+
+    logging.getLogger("report_platform").setLevel(logging.ERROR)
+    meta_module.logger.setLevel(logging.ERROR)
+
+    print("=" * 70)
+    print("BENCHMARK DE ESCRITURAS CONCURRENTES DE METADATA")
+    print("=" * 70)
+    print(f"Procesos: {args.procesos} | Registros por proceso: {args.registros}")
+
+    ok = all([
+        run(backend, args.procesos, args.registros, args.borrar_cada)
+        for backend in (BACKEND_SQLITE, BACKEND_JSONL)
+    ])
+    print("=" * 70)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Tablas de verdad precompiladas de los bloques de texto
+
+Compila las tablas de verdad del plugin informe_auditoria (en memoria, sin
+escribir .truth_tables.json), compara la selección de reglas con y sin
+tablas en contextos aleatorios (incluidos valores fuera de las opciones y
+variables ausentes) y verifica que el resultado es idéntico.
+
+Uso:
+    python benchmarks/bench_truth_tables.py [--contextos 2000] [--repeticiones 5]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from report_platform.core.conditions_engine import (
+    clear_truth_tables,
+    get_rule_index,
+    register_truth_table,
+)
+from report_platform.core.truth_tables import (
+    compile_plugin_truth_tables,
+    get_variable_domains,
+    load_block_conditions,
+    table_from_dict,
+)
+
+PLUGIN_DIR = PROJECT_ROOT / "report_platform" / "reports" / "informe_auditoria"
+CONFIG_DIR = PLUGIN_DIR / "config"
+
+
+def build_contexts(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Contextos aleatorios: opciones válidas, variables ausentes y algún valor desconocido."""
+    rnd = random.Random(seed)
+    domains = get_variable_domains(CONFIG_DIR)
+
+    contexts = []
+    for _ in range(n):
+        context = {}
+        for var_id, values in domains.items():
+            roll = rnd.random()
+            if roll < 0.85:
+                context[var_id] = rnd.choice(values)
+            elif roll < 0.95:
+                context[var_id] = "valor_desconocido"
+        contexts.append(context)
+    return contexts
+
+
+def select_all(indexes, contexts: List[Dict[str, Any]]) -> List[List[Optional[int]]]:
+    """Regla seleccionada por cada bloque en cada contexto."""
+    return [[index.select(ctx) for index in indexes] for ctx in contexts]
+
+
+def best_time(function, repeats: int) -> float:
+    """Devuelve el mejor tiempo (segundos) de varias repeticiones."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contextos", type=int, default=2000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    # Las variables ausentes generan warnings; no interesan en el benchmark
+    logging.getLogger("report_platform").setLevel(logging.CRITICAL)
+    logging.getLogger("report_platform.core.conditions_engine").setLevel(logging.CRITICAL)
+    logging.getLogger("report_platform.core.config_loader").setLevel(logging.CRITICAL)
+    logging.getLogger("report_platform.core.truth_tables").setLevel(logging.CRITICAL)
+
+    contexts = build_contexts(args.contextos)
+    indexes = [get_rule_index(conditions) for _, conditions in load_block_conditions(CONFIG_DIR)]
+
+    start = time.perf_counter()
+    data = compile_plugin_truth_tables(PLUGIN_DIR, CONFIG_DIR)
+    t_compile = time.perf_counter() - start
+    n_rows = sum(len(block['rules']) for block in data['blocks'])
+
+    print("=" * 70)
+    print("BENCHMARK DE TABLAS DE VERDAD")
+    print("=" * 70)
+    print(f"Bloques: {len(indexes)} | Con tabla: {len(data['blocks'])} | "
+          f"Combinaciones: {n_rows} | Compilación: {t_compile * 1000:.1f} ms")
+
+    clear_truth_tables()
+    expected = select_all(indexes, contexts)
+    t_rules = best_time(lambda: select_all(indexes, contexts), args.repeticiones)
+
+    for block in data['blocks']:
+        register_truth_table(table_from_dict(block))
+
+    if select_all(indexes, contexts) != expected:
+        print("❌ La selección con tablas de verdad no coincide")
+        return 1
+    print(f"✅ Selección idéntica en {len(contexts)} contextos")
+
+    t_tables = best_time(lambda: select_all(indexes, contexts), args.repeticiones)
+    clear_truth_tables()
+
+    print(f"\nreglas (RuleIndex): {t_rules * 1000:8.1f} ms")
+    print(f"tablas de verdad:   {t_tables * 1000:8.1f} ms")
+    print(f"Aceleración: x{t_rules / t_tables:.2f}")
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
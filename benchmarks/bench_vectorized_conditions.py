@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Evaluación vectorizada de condiciones (NumPy)
+
+Compara la selección de reglas contexto a contexto (evaluate_all_blocks) con
+la evaluación vectorizada por lotes (evaluate_all_blocks_batch) usando los
+bloques reales del plugin informe_auditoria, y verifica que ambas producen
+exactamente los mismos resultados, también en condiciones que obligan a
+volver a la evaluación contexto a contexto.
+
+Requiere NumPy (dependencia opcional, ver requirements-optional.txt).
+
+Uso:
+    python benchmarks/bench_vectorized_conditions.py [--contextos 5000] [--repeticiones 3]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from report_platform.core.config_loader import (
+    load_conditional_variables,
+    load_text_blocks,
+)
+from report_platform.core.conditions_engine import (
+    compile_condition,
+    evaluate_all_blocks,
+    evaluate_all_blocks_batch,
+    evaluate_condition_batch,
+    numpy_available,
+)
+
+PLUGIN_DIR = PROJECT_ROOT / "report_platform" / "reports" / "informe_auditoria"
+CONFIG_DIR = PLUGIN_DIR / "config"
+
+# Expresiones adicionales con casos límite (listas, tipos mezclados, None...)
+EDGE_CONDITIONS = [
+    "tipo_opinion in ['favorable', 'salvedades']",
+    "tipo_opinion not in ('denegada',)",
+    "importe > 1000 and importe <= 50000",
+    "0 < importe < 10000",
+    "importe != None and importe > 100",
+    "not tipo_opinion",
+    "'a' in etiquetas",
+    "etiquetas is None",
+    "-importe < -500",
+    "variable_inexistente == 'x' or True",
+]
+
+
+def build_contexts(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Genera contextos aleatorios a partir de las opciones de las variables condicionales.
+
+    Algunas variables se omiten y algunos importes son texto para cubrir
+    variables ausentes y comparaciones que lanzan TypeError.
+    """
+    rnd = random.Random(seed)
+    variables = load_conditional_variables(CONFIG_DIR)
+    domains = {v.id: [opt.valor for opt in v.opciones or []] for v in variables}
+
+    contexts = []
+    for _ in range(n):
+        context = {
+            var_id: rnd.choice(values)
+            for var_id, values in domains.items()
+            if values and rnd.random() < 0.9
+        }
+        context['importe'] = rnd.choice([0, 50, 500, 5000, 60000, None, "1000"])
+        context['etiquetas'] = rnd.choice([['a', 'b'], ['c'], None, 'abc'])
+        contexts.append(context)
+    return contexts
+
+
+def best_time(function, repeats: int) -> float:
+    """Devuelve el mejor tiempo (segundos) de varias repeticiones."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contextos", type=int, default=5000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    # Las variables ausentes generan warnings; no interesan en el benchmark
+    logging.getLogger("report_platform").setLevel(logging.CRITICAL)
+    logging.getLogger("report_platform.core.conditions_engine").setLevel(logging.CRITICAL)
+
+    if not numpy_available():
+        print("NumPy no está instalado: pip install -r requirements-optional.txt")
+        return 1
+
+    blocks = load_text_blocks(CONFIG_DIR)
+    contexts = build_contexts(args.contextos)
+    sources = [rule.cuando for block in blocks for rule in block.reglas] + EDGE_CONDITIONS
+
+    print("=" * 70)
+    print("BENCHMARK DE EVALUACIÓN VECTORIZADA DE CONDICIONES")
+    print("=" * 70)
+    print(f"Bloques: {len(blocks)} | Condiciones: {len(sources)} | Contextos: {len(contexts)}")
+
+    mismatches = 0
+    for source in sources:
+        compiled = compile_condition(source)
+        expected = [compiled.evaluate(ctx) for ctx in contexts]
+        if evaluate_condition_batch(source, contexts) != expected:
+            print(f"❌ Resultado distinto: {source}")
+            mismatches += 1
+
+    sequential = [evaluate_all_blocks(blocks, ctx) for ctx in contexts]
+    if evaluate_all_blocks_batch(blocks, contexts) != sequential:
+        print("❌ evaluate_all_blocks_batch no coincide con evaluate_all_blocks")
+        mismatches += 1
+
+    if mismatches:
+        return 1
+    print("✅ Resultados idénticos contexto a contexto y vectorizados")
+
+    t_sequential = best_time(
+        lambda: [evaluate_all_blocks(blocks, ctx) for ctx in contexts], args.repeticiones)
+    t_batch = best_time(
+        lambda: evaluate_all_blocks_batch(blocks, contexts), args.repeticiones)
+
+    print(f"\ncontexto a contexto: {t_sequential * 1000:8.1f} ms")
+    print(f"vectorizado:         {t_batch * 1000:8.1f} ms")
+    print(f"Aceleración: x{t_sequential / t_batch:.2f}")
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
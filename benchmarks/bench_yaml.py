@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Loaders de YAML
+
+Compara yaml.SafeLoader (Python puro) con yaml.CSafeLoader (libyaml) sobre
+los YAML reales del plugin informe_auditoria y verifica que ambos producen
+exactamente los mismos objetos (valores y tipos).
+
+Uso:
+    python benchmarks/bench_yaml.py [--repeticiones 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from report_platform.core.utils import load_yaml
+
+PLUGIN_DIR = PROJECT_ROOT / "report_platform" / "reports" / "informe_auditoria"
+
+
+def same_objects(a: Any, b: Any) -> bool:
+    """Igualdad estricta: mismos valores y mismos tipos en toda la estructura."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(same_objects(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same_objects(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def time_loader(text: str, loader: type, repeats: int) -> float:
+    """Devuelve el mejor tiempo (segundos) de varias repeticiones."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load_yaml(text, loader)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BENCHMARK DE LOADERS DE YAML")
+    print("=" * 70)
+
+    if not hasattr(yaml, 'CSafeLoader'):
+        print("⚠️  PyYAML no está compilado con libyaml: solo está disponible SafeLoader")
+        return 0
+
+    files = [PLUGIN_DIR / "manifest.yaml"] + sorted((PLUGIN_DIR / "config").glob("*.yaml"))
+    ok = True
+
+    for filepath in files:
+        text = filepath.read_text(encoding='utf-8')
+
+        if not same_objects(load_yaml(text, yaml.SafeLoader), load_yaml(text, yaml.CSafeLoader)):
+            print(f"❌ {filepath.name}: los loaders producen objetos distintos")
+            ok = False
+            continue
+
+        t_py = time_loader(text, yaml.SafeLoader, args.repeticiones)
+        t_c = time_loader(text, yaml.CSafeLoader, args.repeticiones)
+        print(f"✅ {filepath.name:32s} {len(text.splitlines()):5d} líneas | "
+              f"SafeLoader {t_py * 1000:7.1f} ms | CSafeLoader {t_c * 1000:6.1f} ms | "
+              f"x{t_py / t_c:.1f}")
+
+    print("=" * 70)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,10 +10,7 @@ Versión: 1.0
 __version__ = "1.0.0"
 __author__ = "Jimmy - Forvis Mazars España"
 
-# Exportar componentes principales del core
-from report_platform.core.config_loader import load_manifest, load_yaml_config
-from report_platform.core.schema_models import SimpleField, BlockDefinition, Manifest
-
+# Exportar componentes principales del core (se importan en el primer acceso)
 __all__ = [
     "load_manifest",
     "load_yaml_config",
@@ -21,3 +18,12 @@ __all__ = [
     "BlockDefinition",
     "Manifest",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from report_platform import core
+        value = getattr(core, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,425 @@
+"""
+Batch - Generación de informes por lotes
+
+Genera un documento Word por cada registro de un archivo de entrada
+(JSONL, CSV o YAML) sin pasar por la interfaz Streamlit. La configuración
+del plugin, su módulo de lógica, las condiciones compiladas y la plantilla
+se cargan una sola vez y se reutilizan para todos los registros.
+
+Con ``--procesos N`` los registros se reparten entre N procesos; cada
+proceso carga el plugin una única vez al arrancar.
+
+Uso:
+    python -m report_platform.batch informe_auditoria registros.jsonl
+    python -m report_platform.batch informe_auditoria registros.csv --salida ./informes
+    python -m report_platform.batch informe_auditoria registros.jsonl --procesos 8
+"""
+
+import argparse
+import csv
+import json
+import os
+import secrets
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple, Callable
+
+from pydantic import BaseModel, Field
+
+from report_platform.core.utils import setup_logger, load_yaml
+from report_platform.core.word_engine import render_word_report, warm_docx_template
+from report_platform.core.metadata import create_metadata, save_metadata
+from report_platform.ui.router import (
+    load_report_plugin,
+    get_build_context_function,
+    create_context_builder,
+    get_template_path,
+)
+
+logger = setup_logger(__name__)
+
+
+# ==============================================================================
+# MODELOS DE RESULTADO
+# ==============================================================================
+
+class BatchRecordResult(BaseModel):
+    """Resultado de la generación de un registro del lote."""
+    index: int = Field(description="Posición del registro en el archivo de entrada")
+    status: str = Field(description="'ok' si se generó el documento, 'error' en caso contrario")
+    output_path: Optional[str] = Field(None, description="Ruta del documento generado")
+    error: Optional[str] = Field(None, description="Mensaje de error si falló")
+    metadata_id: Optional[str] = Field(None, description="ID del registro de metadata guardado")
+
+
+# ==============================================================================
+# LECTURA DE REGISTROS DE ENTRADA
+# ==============================================================================
+
+def load_records(input_path: Path) -> List[Dict[str, Any]]:
+    """
+    Lee los registros de entrada de un archivo JSONL, CSV o YAML.
+
+    - .jsonl: un objeto JSON por línea
+    - .json: lista de objetos (o {'registros': [...]})
+    - .csv: una fila por registro, con cabecera
+    - .yaml/.yml: lista de objetos (o {'registros': [...]})
+
+    Args:
+        input_path: Path al archivo de entrada
+
+    Returns:
+        Lista de diccionarios con los datos de entrada
+    """
+    suffix = input_path.suffix.lower()
+
+    with open(input_path, 'r', encoding='utf-8', newline='') as f:
+        if suffix == '.jsonl':
+            records = [json.loads(line) for line in f if line.strip()]
+        elif suffix == '.json':
+            records = json.load(f)
+        elif suffix == '.csv':
+            records = [dict(row) for row in csv.DictReader(f)]
+        elif suffix in ('.yaml', '.yml'):
+            records = load_yaml(f)
+        else:
+            raise ValueError(f"Formato de entrada no soportado: {input_path.suffix}")
+
+    if isinstance(records, dict):
+        records = records.get('registros', [])
+
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise ValueError(f"{input_path} debe contener una lista de registros")
+
+    logger.info(f"Leídos {len(records)} registros desde {input_path}")
+    return records
+
+
+def coerce_record(record: Dict[str, Any], simple_fields: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Convierte los valores de texto (p. ej. de un CSV) al tipo de cada campo.
+
+    Los campos numéricos se convierten a int/float y los valores vacíos se
+    omiten, igual que si el campo no se hubiera rellenado en el formulario.
+
+    Args:
+        record: Registro de entrada
+        simple_fields: Definiciones de campos simples del plugin
+
+    Returns:
+        Registro con los valores convertidos
+    """
+    numeric_ids = {field.id for field in simple_fields if field.tipo == "numero"}
+    coerced = {}
+
+    for key, value in record.items():
+        if isinstance(value, str):
+            value = value.strip()
+            if value == '':
+                continue
+            if key in numeric_ids:
+                try:
+                    number = float(value.replace(',', '.'))
+                    value = int(number) if number.is_integer() else number
+                except ValueError:
+                    pass
+        coerced[key] = value
+
+    return coerced
+
+
+# ==============================================================================
+# GENERADOR POR LOTES
+# ==============================================================================
+
+def new_run_id() -> str:
+    """
+    Genera el identificador de un lote: fecha y hora más un sufijo aleatorio.
+
+    El sufijo evita que dos lotes lanzados en el mismo segundo (p. ej. dos
+    procesos con la misma --salida) generen los mismos nombres de archivo.
+    """
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(3)}"
+
+
+class BatchGenerator:
+    """
+    Generador de informes reutilizable para muchos registros.
+
+    Carga el plugin (configuración, lógica y plantilla) una sola vez en el
+    constructor; cada llamada a ``generate`` solo construye el contexto y
+    renderiza el documento.
+    """
+
+    def __init__(self, report_id: str, output_dir: Optional[Path] = None,
+                 save_meta: bool = False, run_id: Optional[str] = None):
+        """
+        Carga el plugin.
+
+        Args:
+            report_id: ID del plugin de informe
+            output_dir: Directorio de salida (por defecto get_outputs_dir())
+            save_meta: Si debe guardar metadatos de cada informe generado
+            run_id: Identificador del lote para los nombres de archivo (opcional)
+        """
+        plugin_config = load_report_plugin(report_id)
+        if not plugin_config:
+            raise ValueError(f"No se pudo cargar el plugin: {report_id}")
+
+        self.report_id = report_id
+        self.plugin_config = plugin_config
+        self.manifest = plugin_config['manifest']
+        self.output_dir = output_dir
+        self.save_meta = save_meta
+        self.template_path = get_template_path(plugin_config)
+        self.build_context = get_build_context_function(plugin_config)
+        self.context_builder = create_context_builder(plugin_config)
+        self.run_id = run_id or new_run_id()
+
+    def output_filename(self, index: int) -> str:
+        """Nombre del archivo de salida de un registro."""
+        return f"{self.manifest.id}_{self.run_id}_{index:04d}"
+
+    def build(self, data_in: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Construye el contexto de la plantilla para unos datos de entrada.
+
+        Args:
+            data_in: Datos de entrada ya convertidos (ver coerce_record)
+
+        Returns:
+            Contexto para la plantilla Word
+        """
+        if self.context_builder is not None:
+            return self.context_builder.build(data_in)
+        return self.build_context(data_in, self.plugin_config['config_dir'])
+
+    def generate(self, record: Dict[str, Any], index: int) -> BatchRecordResult:
+        """
+        Genera el documento de un registro.
+
+        Los errores se capturan y se devuelven en el resultado, de modo que
+        un registro inválido no interrumpe el resto del lote.
+
+        Args:
+            record: Datos de entrada del registro
+            index: Posición del registro en el lote
+
+        Returns:
+            BatchRecordResult con la ruta generada o el error
+        """
+        try:
+            data_in = coerce_record(record, self.plugin_config['simple_fields'])
+
+            context = self.build(data_in)
+
+            output_path = render_word_report(
+                self.template_path,
+                context,
+                self.output_filename(index),
+                output_dir=self.output_dir,
+            )
+            if output_path is None:
+                return BatchRecordResult(index=index, status='error',
+                                         error="No se pudo renderizar el documento")
+
+            metadata_id = None
+            if self.save_meta:
+                metadata = create_metadata(
+                    report_id=self.manifest.id,
+                    report_name=self.manifest.nombre,
+                    template_version=self.manifest.version,
+                    input_data=data_in,
+                    output_path=output_path,
+                    generated_by="batch",
+                    description=None,
+                )
+                save_metadata(metadata)
+                metadata_id = metadata.id
+
+            return BatchRecordResult(index=index, status='ok',
+                                     output_path=str(output_path),
+                                     metadata_id=metadata_id)
+
+        except Exception as e:
+            logger.error(f"Error generando registro {index}: {e}")
+            return BatchRecordResult(index=index, status='error', error=str(e))
+
+
+def generate_batch(report_id: str, records: List[Dict[str, Any]],
+                   output_dir: Optional[Path] = None,
+                   save_meta: bool = False,
+                   workers: int = 1) -> List[BatchRecordResult]:
+    """
+    Genera un documento por registro con el plugin indicado.
+
+    Args:
+        report_id: ID del plugin de informe
+        records: Lista de datos de entrada
+        output_dir: Directorio de salida (opcional)
+        save_meta: Si debe guardar metadatos de cada informe
+        workers: Número de procesos (1 = secuencial, 0 = uno por CPU)
+
+    Returns:
+        Lista de BatchRecordResult en el mismo orden que ``records``
+    """
+    results = sorted(
+        iter_generate(report_id, enumerate(records), output_dir=output_dir,
+                      save_meta=save_meta, workers=workers),
+        key=lambda r: r.index,
+    )
+
+    ok = sum(1 for r in results if r.status == 'ok')
+    logger.info(f"Lote completado: {ok}/{len(results)} informes generados")
+    return results
+
+
+# ==============================================================================
+# EJECUCIÓN EN PARALELO (POOL DE PROCESOS)
+# ==============================================================================
+
+# Generador del proceso worker, creado una sola vez por _init_worker
+_worker_generator: Optional[BatchGenerator] = None
+
+
+def _init_worker(report_id: str, output_dir: Optional[Path], save_meta: bool,
+                 run_id: str) -> None:
+    """Inicializa un proceso worker cargando el plugin y la plantilla una única vez."""
+    global _worker_generator
+    _worker_generator = BatchGenerator(report_id, output_dir=output_dir,
+                                       save_meta=save_meta, run_id=run_id)
+    warm_docx_template(_worker_generator.template_path)
+
+
+def _generate_in_worker(index: int, record: Dict[str, Any]) -> BatchRecordResult:
+    """Genera un registro con el generador del worker."""
+    return _worker_generator.generate(record, index)
+
+
+def iter_generate(report_id: str, items: Iterable[Tuple[int, Dict[str, Any]]],
+                  output_dir: Optional[Path] = None,
+                  save_meta: bool = False,
+                  workers: int = 1,
+                  run_id: Optional[str] = None,
+                  on_start: Optional[Callable[[int], None]] = None) -> Iterator[BatchRecordResult]:
+    """
+    Genera los registros indicados y devuelve cada resultado en cuanto está listo.
+
+    Con varios procesos los resultados llegan en orden de finalización y solo
+    se envían al pool unos pocos registros por proceso a la vez, de modo que
+    un registro enviado está a punto de generarse. Si un worker falla de
+    forma inesperada (p. ej. el proceso muere), solo se marcan como erróneos
+    los registros afectados.
+
+    Args:
+        report_id: ID del plugin de informe
+        items: Pares (índice, registro)
+        output_dir: Directorio de salida (opcional)
+        save_meta: Si debe guardar metadatos de cada informe
+        workers: Número de procesos (1 = secuencial, 0 = uno por CPU)
+        run_id: Identificador del lote para los nombres de archivo (opcional)
+        on_start: Función llamada con el índice de cada registro justo antes
+            de generarlo o de enviarlo al pool (opcional)
+
+    Yields:
+        BatchRecordResult de cada registro
+    """
+    items = list(items)
+    run_id = run_id or new_run_id()
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(len(items), 1))
+
+    if workers == 1:
+        generator = BatchGenerator(report_id, output_dir=output_dir,
+                                   save_meta=save_meta, run_id=run_id)
+        for idx, record in items:
+            if on_start is not None:
+                on_start(idx)
+            yield generator.generate(record, idx)
+        return
+
+    logger.info(f"Generando {len(items)} registros con {workers} procesos")
+
+    # Registros en vuelo: los que se están generando más uno en cola por proceso
+    max_in_flight = workers * 2
+    pending_items = iter(items)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(report_id, output_dir, save_meta, run_id),
+    ) as executor:
+        futures = {}
+
+        def submit_next() -> List[BatchRecordResult]:
+            """Envía registros hasta llenar el pool; devuelve los que no se pudieron enviar."""
+            errors = []
+            for idx, record in pending_items:
+                if on_start is not None:
+                    on_start(idx)
+                try:
+                    futures[executor.submit(_generate_in_worker, idx, record)] = idx
+                except Exception as e:
+                    # El pool ya no acepta trabajos (p. ej. un worker murió)
+                    logger.error(f"Error en el worker para el registro {idx}: {e}")
+                    errors.append(BatchRecordResult(index=idx, status='error', error=str(e)))
+                if len(futures) >= max_in_flight:
+                    break
+            return errors
+
+        yield from submit_next()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Error en el worker para el registro {idx}: {e}")
+                    result = BatchRecordResult(index=idx, status='error', error=str(e))
+                yield result
+            yield from submit_next()
+
+
+# ==============================================================================
+# LÍNEA DE COMANDOS
+# ==============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de ``python -m report_platform.batch``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m report_platform.batch",
+        description="Genera un informe Word por cada registro de un archivo de entrada.",
+    )
+    parser.add_argument("report_id", help="ID del plugin de informe (p. ej. informe_auditoria)")
+    parser.add_argument("entrada", type=Path, help="Archivo de registros (.jsonl, .json, .csv, .yaml)")
+    parser.add_argument("--salida", type=Path, default=None,
+                        help="Directorio de salida (por defecto /mnt/user-data/outputs)")
+    parser.add_argument("--metadatos", action="store_true",
+                        help="Guardar metadatos de cada informe generado")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="Número de procesos en paralelo (0 = uno por CPU)")
+    args = parser.parse_args(argv)
+
+    records = load_records(args.entrada)
+    results = generate_batch(args.report_id, records,
+                             output_dir=args.salida, save_meta=args.metadatos,
+                             workers=args.procesos)
+
+    for result in results:
+        if result.status == 'ok':
+            print(f"✅ [{result.index}] {result.output_path}")
+        else:
+            print(f"❌ [{result.index}] {result.error}")
+
+    failed = sum(1 for r in results if r.status != 'ok')
+    print(f"\nGenerados {len(results) - failed}/{len(results)} informes")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
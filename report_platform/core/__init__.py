@@ -12,15 +12,33 @@ Módulos:
     - tables_engine: Validación de tablas
     - ui_runtime: Generación dinámica de controles UI
     - utils: Utilidades generales
+
+Los nombres exportados se importan en el primer acceso (PEP 562), de modo
+que importar un submódulo ligero no arrastra Pydantic ni los modelos.
 """
 
-from .config_loader import load_manifest, load_yaml_config
-from .schema_models import SimpleField, BlockDefinition, Manifest
+import importlib
+
+# nombre exportado -> submódulo que lo define
+_LAZY_EXPORTS = {
+    "load_manifest": "config_loader",
+    "load_yaml_config": "config_loader",
+    "SimpleField": "schema_models",
+    "BlockDefinition": "schema_models",
+    "Manifest": "schema_models",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = [
-    "load_manifest",
-    "load_yaml_config",
-    "SimpleField",
-    "BlockDefinition",
-    "Manifest",
-]
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -9,7 +9,10 @@ solo permite operadores seguros (comparación, lógica, paréntesis).
 """
 
 import ast
-from typing import Dict, Any, List, Optional, Union
+import itertools
+import operator
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Union, Callable, Sequence, Tuple
 from report_platform.core.utils import setup_logger
 from report_platform.core.schema_models import BlockDefinition, BlockRule
 
@@ -157,10 +160,610 @@ class SafeConditionEvaluator(ast.NodeVisitor):
         )
 
 
+# ==============================================================================
+# BACKEND DE CLOSURES PRECOMPILADAS
+# ==============================================================================
+
+# Operadores de comparación resueltos una sola vez al compilar
+_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+_UNARY_OPERATORS = {
+    ast.Not: operator.not_,
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+ConditionFunction = Callable[[Dict[str, Any]], Any]
+
+
+def build_condition_closure(node: ast.AST) -> ConditionFunction:
+    """
+    Convierte un AST de condición en un árbol de closures de Python.
+
+    Cada nodo se resuelve una sola vez (operador, constantes, nombres), de modo
+    que evaluar la condición solo ejecuta llamadas a funciones ya enlazadas.
+    Mantiene la semántica de SafeConditionEvaluator: evaluación en cortocircuito,
+    comparaciones encadenadas y variables ausentes resueltas a None.
+
+    Args:
+        node: Nodo AST (cuerpo de la expresión) ya validado
+
+    Returns:
+        Función que recibe el contexto y devuelve el valor de la expresión
+    """
+    if isinstance(node, ast.BoolOp):
+        values = tuple(build_condition_closure(value) for value in node.values)
+        if isinstance(node.op, ast.And):
+            return lambda ctx: all(value(ctx) for value in values)
+        elif isinstance(node.op, ast.Or):
+            return lambda ctx: any(value(ctx) for value in values)
+        raise ValueError(f"Operador booleano no soportado: {node.op}")
+
+    if isinstance(node, ast.UnaryOp):
+        unary = _UNARY_OPERATORS.get(type(node.op))
+        if unary is None:
+            raise ValueError(f"Operador unario no soportado: {node.op}")
+        operand = build_condition_closure(node.operand)
+        return lambda ctx: unary(operand(ctx))
+
+    if isinstance(node, ast.Compare):
+        return _build_compare_closure(node)
+
+    if isinstance(node, ast.Name):
+        return _build_name_closure(node.id)
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda ctx: value
+
+    if isinstance(node, ast.List):
+        elts = tuple(build_condition_closure(elem) for elem in node.elts)
+        return lambda ctx: [elem(ctx) for elem in elts]
+
+    if isinstance(node, ast.Tuple):
+        elts = tuple(build_condition_closure(elem) for elem in node.elts)
+        return lambda ctx: tuple(elem(ctx) for elem in elts)
+
+    raise ValueError(
+        f"Operación no permitida en expresión de condición: {node.__class__.__name__}"
+    )
+
+
+def _build_name_closure(var_name: str) -> ConditionFunction:
+    """Closure que resuelve una variable del contexto (None si no existe)."""
+    if var_name == 'True':
+        return lambda ctx: True
+    elif var_name == 'False':
+        return lambda ctx: False
+    elif var_name == 'None':
+        return lambda ctx: None
+
+    missing = object()
+
+    def lookup(ctx: Dict[str, Any]) -> Any:
+        value = ctx.get(var_name, missing)
+        if value is missing:
+            logger.warning(f"Variable '{var_name}' no encontrada en contexto")
+            return None
+        return value
+
+    return lookup
+
+
+def _build_compare_closure(node: ast.Compare) -> ConditionFunction:
+    """Closure para comparaciones, simples o encadenadas (a < b < c)."""
+    left = build_condition_closure(node.left)
+    steps = []
+    for op, comparator in zip(node.ops, node.comparators):
+        compare = _COMPARE_OPERATORS.get(type(op))
+        if compare is None:
+            raise ValueError(f"Operador de comparación no soportado: {op}")
+        steps.append((compare, build_condition_closure(comparator)))
+
+    if len(steps) == 1:
+        compare, right = steps[0]
+        return lambda ctx: bool(compare(left(ctx), right(ctx)))
+
+    chain = tuple(steps)
+
+    def compare_chain(ctx: Dict[str, Any]) -> bool:
+        current = left(ctx)
+        for compare, right in chain:
+            value = right(ctx)
+            if not compare(current, value):
+                return False
+            current = value
+        return True
+
+    return compare_chain
+
+
+# ==============================================================================
+# BACKEND VECTORIZADO (NUMPY, MUCHOS CONTEXTOS A LA VEZ)
+# ==============================================================================
+
+# Función que recibe las columnas de un lote y devuelve un array (o escalar)
+VectorFunction = Callable[['ContextColumns'], Any]
+
+
+@lru_cache(maxsize=1)
+def _get_numpy() -> Optional[Any]:
+    """
+    Importa NumPy bajo demanda (dependencia opcional).
+
+    Returns:
+        Módulo numpy o None si no está instalado
+    """
+    try:
+        import numpy
+    except ImportError:
+        logger.info("NumPy no está instalado: los lotes se evalúan contexto a contexto")
+        return None
+    return numpy
+
+
+def numpy_available() -> bool:
+    """True si NumPy está instalado y se puede usar la evaluación vectorizada."""
+    return _get_numpy() is not None
+
+
+class ContextColumns:
+    """
+    Vista columnar de una lista de contextos: un array NumPy por variable.
+
+    Las columnas se construyen bajo demanda y se reutilizan entre todas las
+    condiciones evaluadas sobre el mismo lote. Una variable ausente en un
+    contexto vale None en su columna (igual que en la evaluación contexto a
+    contexto) y queda marcada en la máscara ``missing``.
+    """
+
+    def __init__(self, contexts: Sequence[Dict[str, Any]]):
+        """
+        Args:
+            contexts: Contextos del lote, en orden
+        """
+        np = _get_numpy()
+        if np is None:
+            raise ImportError("NumPy no está instalado. Instalarlo con: pip install numpy")
+
+        self.np = np
+        self.contexts = contexts
+        self.size = len(contexts)
+        self._columns: Dict[str, Tuple[Any, Any]] = {}
+
+    def column(self, var_name: str) -> Tuple[Any, Any]:
+        """
+        Devuelve la columna de una variable.
+
+        Args:
+            var_name: Nombre de la variable
+
+        Returns:
+            Tupla (valores, missing): array de objetos con el valor en cada
+            contexto (None si falta) y máscara booleana de contextos sin ella
+        """
+        cached = self._columns.get(var_name)
+        if cached is None:
+            np = self.np
+            values = np.empty(self.size, dtype=object)
+            missing = np.zeros(self.size, dtype=bool)
+            for row, context in enumerate(self.contexts):
+                if var_name in context:
+                    values[row] = context[var_name]
+                else:
+                    missing[row] = True
+            cached = self._columns[var_name] = (values, missing)
+        return cached
+
+    def constant(self, value: Any) -> Any:
+        """Array 0-d de objetos con un valor, para operar por difusión con las columnas."""
+        array = self.np.empty((), dtype=object)
+        array[()] = value
+        return array
+
+    def truth(self, value: Any) -> Any:
+        """Máscara booleana con la veracidad de un valor vectorial o escalar."""
+        np = self.np
+        if isinstance(value, np.ndarray) and value.ndim == 1:
+            return value if value.dtype == bool else value.astype(bool)
+        if isinstance(value, np.ndarray):
+            value = value.item()
+        return np.full(self.size, bool(value))
+
+
+def _vector_is(left: Any, right: Any) -> bool:
+    return left is right
+
+
+def _vector_is_not(left: Any, right: Any) -> bool:
+    return left is not right
+
+
+def _vector_contains(left: Any, right: Any) -> bool:
+    return left in right
+
+
+def _vector_not_contains(left: Any, right: Any) -> bool:
+    return left not in right
+
+
+def build_vector_closure(node: ast.AST) -> VectorFunction:
+    """
+    Convierte un AST de condición en una función sobre columnas de NumPy.
+
+    Las comparaciones (==, !=, <, ...) se convierten en operaciones de NumPy
+    sobre arrays de objetos y ``in`` con una lista literal en un OR de
+    igualdades; and/or/not operan sobre máscaras booleanas. El resultado es
+    el mismo que el de la evaluación contexto a contexto siempre que la
+    operación vectorizada no lance excepciones (ver evaluate_columns).
+
+    Args:
+        node: Nodo AST (cuerpo de la expresión) ya validado
+
+    Returns:
+        Función que recibe un ContextColumns y devuelve un array (o escalar)
+
+    Raises:
+        ValueError: Si la expresión contiene construcciones no vectorizables
+    """
+    if isinstance(node, ast.BoolOp):
+        values = tuple(build_vector_closure(value) for value in node.values)
+        if isinstance(node.op, ast.And):
+            return lambda cols: cols.np.logical_and.reduce([cols.truth(v(cols)) for v in values])
+        elif isinstance(node.op, ast.Or):
+            return lambda cols: cols.np.logical_or.reduce([cols.truth(v(cols)) for v in values])
+        raise ValueError(f"Operador booleano no soportado: {node.op}")
+
+    if isinstance(node, ast.UnaryOp):
+        operand = build_vector_closure(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda cols: ~cols.truth(operand(cols))
+        elif isinstance(node.op, ast.USub):
+            return lambda cols: cols.np.negative(operand(cols))
+        elif isinstance(node.op, ast.UAdd):
+            return lambda cols: cols.np.positive(operand(cols))
+        raise ValueError(f"Operador unario no soportado: {node.op}")
+
+    if isinstance(node, ast.Compare):
+        return _build_vector_compare(node)
+
+    if isinstance(node, ast.Name):
+        return _build_vector_name(node.id)
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda cols: cols.constant(value)
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        if not all(isinstance(elem, ast.Constant) for elem in node.elts):
+            raise ValueError("Solo se vectorizan listas de constantes")
+        elts = [elem.value for elem in node.elts]
+        value = elts if isinstance(node, ast.List) else tuple(elts)
+        return lambda cols: cols.constant(value)
+
+    raise ValueError(
+        f"Operación no permitida en expresión de condición: {node.__class__.__name__}"
+    )
+
+
+def _build_vector_name(var_name: str) -> VectorFunction:
+    """Columna de una variable del lote (None en los contextos donde falta)."""
+    if var_name in ('True', 'False', 'None'):
+        value = {'True': True, 'False': False, 'None': None}[var_name]
+        return lambda cols: cols.constant(value)
+
+    def lookup(cols: ContextColumns) -> Any:
+        values, missing = cols.column(var_name)
+        n_missing = int(missing.sum())
+        if n_missing:
+            logger.warning(
+                f"Variable '{var_name}' no encontrada en {n_missing} de {cols.size} contextos"
+            )
+        return values
+
+    return lookup
+
+
+def _build_vector_compare_step(op: ast.cmpop, comparator: ast.AST) -> Callable[[Any, Any, Any], Any]:
+    """Operación vectorizada (cols, izquierda, derecha) -> máscara para un operador."""
+    if isinstance(op, (ast.In, ast.NotIn)) and isinstance(comparator, (ast.List, ast.Tuple)) \
+            and all(isinstance(elem, ast.Constant) for elem in comparator.elts):
+        # "x in ['a', 'b']" -> (x == 'a') | (x == 'b')
+        options = [elem.value for elem in comparator.elts]
+        negate = isinstance(op, ast.NotIn)
+
+        def contains_literal(cols, left, right):
+            mask = cols.np.zeros(cols.size, dtype=bool)
+            for option in options:
+                mask |= cols.truth(cols.np.equal(left, cols.constant(option)))
+            return ~mask if negate else mask
+
+        return contains_literal
+
+    ufunc_names = {
+        ast.Eq: 'equal', ast.NotEq: 'not_equal',
+        ast.Lt: 'less', ast.LtE: 'less_equal',
+        ast.Gt: 'greater', ast.GtE: 'greater_equal',
+    }
+    python_ops = {
+        ast.In: _vector_contains, ast.NotIn: _vector_not_contains,
+        ast.Is: _vector_is, ast.IsNot: _vector_is_not,
+    }
+
+    if type(op) in ufunc_names:
+        name = ufunc_names[type(op)]
+        return lambda cols, left, right: cols.truth(getattr(cols.np, name)(left, right))
+
+    if type(op) in python_ops:
+        function = python_ops[type(op)]
+        return lambda cols, left, right: cols.truth(
+            cols.np.frompyfunc(function, 2, 1)(left, right)
+        )
+
+    raise ValueError(f"Operador de comparación no soportado: {op}")
+
+
+def _build_vector_compare(node: ast.Compare) -> VectorFunction:
+    """Comparaciones vectorizadas, simples o encadenadas (a < b < c)."""
+    left = build_vector_closure(node.left)
+    chain = tuple(
+        (_build_vector_compare_step(op, comparator), build_vector_closure(comparator))
+        for op, comparator in zip(node.ops, node.comparators)
+    )
+
+    def compare(cols: ContextColumns) -> Any:
+        current = left(cols)
+        mask = None
+        for step, right in chain:
+            value = right(cols)
+            result = step(cols, current, value)
+            mask = result if mask is None else mask & result
+            current = value
+        return mask
+
+    return compare
+
+
+# ==============================================================================
+# COMPILACIÓN Y CACHÉ DE CONDICIONES
+# ==============================================================================
+
+# Tamaño máximo de la caché LRU de condiciones compiladas
+CONDITION_CACHE_SIZE = 4096
+
+# Backends de evaluación disponibles: closures precompiladas o visitante AST
+BACKEND_CLOSURE = 'closure'
+BACKEND_VISITOR = 'visitor'
+DEFAULT_BACKEND = BACKEND_CLOSURE
+
+# Nodos AST admitidos en una expresión de condición
+_ALLOWED_NODES = (
+    ast.BoolOp, ast.And, ast.Or,
+    ast.UnaryOp, ast.Not, ast.UAdd, ast.USub,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.In, ast.NotIn, ast.Is, ast.IsNot,
+    ast.Name, ast.Load, ast.Constant, ast.List, ast.Tuple,
+)
+
+
+class CompiledCondition:
+    """
+    Condición parseada y validada una sola vez, reutilizable en cualquier contexto.
+
+    El AST se valida contra la lista blanca de nodos al compilar, de modo que
+    evaluar la condición no requiere volver a parsear la expresión. Con el
+    backend 'closure' el AST se traduce además a un árbol de closures; con
+    'visitor' se recorre con SafeConditionEvaluator en cada evaluación.
+    """
+
+    __slots__ = ('source', 'backend', 'tree', 'function', 'error', 'equality', 'always_true',
+                 'vector')
+
+    def __init__(self, source: str, backend: str = DEFAULT_BACKEND):
+        """
+        Parsea y valida la expresión.
+
+        Args:
+            source: Expresión de condición como string
+            backend: 'closure' (por defecto) o 'visitor'
+        """
+        if backend not in (BACKEND_CLOSURE, BACKEND_VISITOR):
+            raise ValueError(f"Backend de condiciones desconocido: {backend}")
+
+        self.source = source
+        self.backend = backend
+        self.tree: Optional[ast.AST] = None
+        self.function: Optional[ConditionFunction] = None
+        self.error: Optional[Exception] = None
+        # (variable, valor) si la condición es de la forma "variable == 'valor'"
+        self.equality: Optional[tuple] = None
+        # True si la condición se cumple siempre (vacía o literal verdadero)
+        self.always_true = False
+        # Función vectorizada (se construye al primer uso; False si no es vectorizable)
+        self.vector: Any = None
+
+        if not source or source.strip() == '':
+            self.always_true = True
+            return
+
+        try:
+            expression = ast.parse(source, mode='eval')
+            for node in ast.walk(expression.body):
+                if not isinstance(node, _ALLOWED_NODES):
+                    raise ValueError(
+                        f"Operación no permitida en expresión de condición: {node.__class__.__name__}"
+                    )
+            self.tree = expression.body
+            if backend == BACKEND_CLOSURE:
+                self.function = build_condition_closure(self.tree)
+        except (SyntaxError, ValueError) as e:
+            self.error = e
+            return
+
+        self.equality = _match_equality(self.tree)
+        self.always_true = isinstance(self.tree, ast.Constant) and bool(self.tree.value)
+
+    @property
+    def is_valid(self) -> bool:
+        """True si la expresión es sintácticamente correcta y segura."""
+        return self.error is None
+
+    def evaluate(self, context: Dict[str, Any]) -> bool:
+        """
+        Evalúa la condición compilada en un contexto dado.
+
+        Args:
+            context: Diccionario con las variables disponibles
+
+        Returns:
+            True si la condición se cumple, False en caso contrario
+        """
+        if self.error is not None:
+            if isinstance(self.error, SyntaxError):
+                logger.error(f"Error de sintaxis en condición '{self.source}': {self.error}")
+            else:
+                logger.error(f"Error evaluando condición '{self.source}': {self.error}")
+            return False
+
+        if self.tree is None:
+            return True
+
+        try:
+            if self.function is not None:
+                return bool(self.function(context))
+            return bool(SafeConditionEvaluator(context).visit(self.tree))
+
+        except ValueError as e:
+            logger.error(f"Error evaluando condición '{self.source}': {e}")
+            return False
+
+        except Exception as e:
+            logger.warning(f"Error inesperado evaluando condición '{self.source}': {e}")
+            return False
+
+    def evaluate_columns(self, columns: ContextColumns, rows: Optional[Any] = None) -> Any:
+        """
+        Evalúa la condición en todos los contextos de un lote a la vez.
+
+        El resultado en cada contexto es el mismo que el de ``evaluate``. Si la
+        expresión no es vectorizable o la operación vectorizada lanza una
+        excepción (p. ej. comparar texto con números), los contextos
+        solicitados se evalúan uno a uno con ``evaluate``.
+
+        Args:
+            columns: Contextos del lote en forma columnar
+            rows: Máscara booleana de los contextos a evaluar (por defecto todos)
+
+        Returns:
+            Máscara booleana NumPy (False en los contextos no solicitados)
+        """
+        np = columns.np
+        if rows is None:
+            rows = np.ones(columns.size, dtype=bool)
+
+        if self.error is not None:
+            self.evaluate({})  # Registra el error una vez
+            return np.zeros(columns.size, dtype=bool)
+
+        if self.tree is None:
+            return rows.copy()
+
+        if self.vector is None:
+            try:
+                self.vector = build_vector_closure(self.tree)
+            except ValueError as e:
+                logger.debug(f"Condición no vectorizable '{self.source}': {e}")
+                self.vector = False
+
+        if self.vector is not False:
+            try:
+                return columns.truth(self.vector(columns)) & rows
+            except Exception as e:
+                logger.debug(f"Evaluación vectorizada fallida para '{self.source}': {e}")
+
+        # Evaluación contexto a contexto de las filas solicitadas
+        mask = np.zeros(columns.size, dtype=bool)
+        for row in np.flatnonzero(rows):
+            mask[row] = self.evaluate(columns.contexts[row])
+        return mask
+
+    def __repr__(self) -> str:
+        return f"CompiledCondition({self.source!r}, backend={self.backend!r})"
+
+
+def _match_equality(node: ast.AST) -> Optional[tuple]:
+    """
+    Detecta igualdades simples entre una variable y una constante.
+
+    Args:
+        node: Cuerpo de la expresión ya validado
+
+    Returns:
+        Tupla (variable, valor) o None si la condición no es una igualdad simple
+    """
+    if not (isinstance(node, ast.Compare) and len(node.ops) == 1
+            and isinstance(node.ops[0], ast.Eq)):
+        return None
+
+    left, right = node.left, node.comparators[0]
+    if isinstance(right, ast.Name) and isinstance(left, ast.Constant):
+        left, right = right, left
+
+    if not (isinstance(left, ast.Name) and isinstance(right, ast.Constant)):
+        return None
+    if left.id in ('True', 'False', 'None'):
+        return None
+
+    try:
+        hash(right.value)
+    except TypeError:
+        return None
+
+    return (left.id, right.value)
+
+
+@lru_cache(maxsize=CONDITION_CACHE_SIZE)
+def compile_condition(condition: str, backend: str = DEFAULT_BACKEND) -> CompiledCondition:
+    """
+    Compila una condición, reutilizando la versión cacheada si ya se compiló.
+
+    La caché es LRU y está indexada por el texto de la expresión, por lo que
+    las condiciones de los YAML de un plugin se parsean una sola vez por proceso.
+
+    Args:
+        condition: Expresión de condición como string
+        backend: 'closure' (por defecto) o 'visitor'
+
+    Returns:
+        CompiledCondition lista para evaluarse
+    """
+    return CompiledCondition(condition, backend)
+
+
+def clear_condition_cache() -> None:
+    """Vacía la caché de condiciones compiladas."""
+    compile_condition.cache_clear()
+    get_rule_index.cache_clear()
+
+
 def evaluate_condition(condition: str, context: Dict[str, Any]) -> bool:
     """
     Evalúa una condición en un contexto dado de forma segura usando AST.
 
+    La expresión se compila una sola vez y se reutiliza desde la caché
+    (ver ``compile_condition``).
+
     Args:
         condition: Expresión de condición como string
                   (ej: "tipo_opinion == 'favorable' and pais == 'ES'")
@@ -183,27 +786,32 @@ def evaluate_condition(condition: str, context: Dict[str, Any]) -> bool:
     if not condition or condition.strip() == '':
         return True
 
-    try:
-        # Parsear la expresión a AST
-        tree = ast.parse(condition, mode='eval')
+    return compile_condition(condition).evaluate(context)
 
-        # Evaluar usando el visitante seguro
-        evaluator = SafeConditionEvaluator(context)
-        result = evaluator.visit(tree.body)
 
-        return bool(result)
+def evaluate_condition_batch(condition: str, contexts: Sequence[Dict[str, Any]]) -> List[bool]:
+    """
+    Evalúa una condición en muchos contextos a la vez.
 
-    except SyntaxError as e:
-        logger.error(f"Error de sintaxis en condición '{condition}': {e}")
-        return False
+    Con NumPy instalado la condición se evalúa de forma vectorizada sobre
+    columnas (ver ContextColumns); sin NumPy, contexto a contexto. El
+    resultado es idéntico al de llamar a evaluate_condition en cada contexto.
 
-    except ValueError as e:
-        logger.error(f"Error evaluando condición '{condition}': {e}")
-        return False
+    Args:
+        condition: Expresión de condición como string
+        contexts: Lista de contextos
 
-    except Exception as e:
-        logger.warning(f"Error inesperado evaluando condición '{condition}': {e}")
-        return False
+    Returns:
+        Lista de booleanos, uno por contexto
+    """
+    if not numpy_available():
+        return [evaluate_condition(condition, context) for context in contexts]
+
+    if not condition or condition.strip() == '':
+        return [True] * len(contexts)
+
+    columns = ContextColumns(contexts)
+    return compile_condition(condition).evaluate_columns(columns).tolist()
 
 
 # ==============================================================================
@@ -263,6 +871,262 @@ def should_show_field(field_id: str, dependency_condition: Optional[str],
     return evaluate_condition(dependency_condition, context)
 
 
+# ==============================================================================
+# ÍNDICE DE REGLAS (TABLA DE DECISIÓN)
+# ==============================================================================
+
+class RuleIndex:
+    """
+    Índice para seleccionar la primera regla que coincide en un bloque.
+
+    Analiza las condiciones de las reglas y, si varias son igualdades simples
+    sobre la misma variable (p. ej. "tipo_opinion == 'favorable'"), construye
+    un diccionario valor -> primera regla con ese valor. El resto de reglas se
+    evalúan en orden solo si preceden a la candidata del índice, de modo que
+    la semántica de "primera regla que coincide" se mantiene exactamente.
+
+    Si hay una tabla de verdad registrada para estas condiciones (ver
+    TruthTable), se consulta primero y solo se evalúa si el contexto no está
+    en la tabla.
+    """
+
+    def __init__(self, conditions: Sequence[str],
+                 truth_table: Optional['TruthTable'] = None):
+        """
+        Compila las condiciones y construye el índice.
+
+        Args:
+            conditions: Condiciones ('cuando') de las reglas, en orden
+            truth_table: Tabla de verdad precompilada (opcional)
+        """
+        self.conditions = [compile_condition(cond) for cond in conditions]
+        self.truth_table = truth_table
+        self.discriminator: Optional[str] = None
+        self._first_by_value: Dict[Any, int] = {}
+        self._fallback: List[int] = []
+
+        # Elegir como discriminador la variable con más igualdades simples
+        counts: Dict[str, int] = {}
+        for compiled in self.conditions:
+            if compiled.equality:
+                var_name = compiled.equality[0]
+                counts[var_name] = counts.get(var_name, 0) + 1
+
+        if not counts or max(counts.values()) < 2:
+            return
+
+        self.discriminator = max(counts, key=counts.get)
+
+        for idx, compiled in enumerate(self.conditions):
+            if compiled.equality and compiled.equality[0] == self.discriminator:
+                self._first_by_value.setdefault(compiled.equality[1], idx)
+            else:
+                self._fallback.append(idx)
+
+    def select(self, context: Dict[str, Any]) -> Optional[int]:
+        """
+        Devuelve el índice de la primera regla que se cumple en el contexto.
+
+        Args:
+            context: Contexto con variables
+
+        Returns:
+            Índice de la regla o None si ninguna coincide
+        """
+        if self.truth_table is not None:
+            rule_idx = self.truth_table.lookup(context)
+            if rule_idx is not TABLE_MISS:
+                return rule_idx
+
+        discriminator = self.discriminator
+        if discriminator is None or discriminator not in context:
+            return self._linear_scan(context)
+
+        try:
+            candidate = self._first_by_value.get(context[discriminator])
+        except TypeError:
+            # Valor no hashable: evaluar regla a regla
+            return self._linear_scan(context)
+
+        for idx in self._fallback:
+            if candidate is not None and idx > candidate:
+                break
+            compiled = self.conditions[idx]
+            if compiled.always_true or compiled.evaluate(context):
+                return idx
+
+        return candidate
+
+    def select_batch(self, columns: ContextColumns) -> List[Optional[int]]:
+        """
+        Selecciona la primera regla que se cumple en cada contexto de un lote.
+
+        Cada condición se evalúa de forma vectorizada solo sobre los contextos
+        que aún no tienen regla, y se deja de evaluar en cuanto todos la tienen.
+
+        Args:
+            columns: Contextos del lote en forma columnar
+
+        Returns:
+            Índice de la regla (o None) para cada contexto, en orden
+        """
+        np = columns.np
+        selected = np.full(columns.size, -1, dtype=np.int64)
+        remaining = np.ones(columns.size, dtype=bool)
+
+        for idx, compiled in enumerate(self.conditions):
+            if not remaining.any():
+                break
+            if compiled.always_true:
+                selected[remaining] = idx
+                break
+            matched = compiled.evaluate_columns(columns, remaining)
+            selected[matched] = idx
+            remaining &= ~matched
+
+        return [int(idx) if idx >= 0 else None for idx in selected]
+
+    def _linear_scan(self, context: Dict[str, Any]) -> Optional[int]:
+        """Evalúa las reglas en orden hasta encontrar una que se cumpla."""
+        for idx, compiled in enumerate(self.conditions):
+            if compiled.evaluate(context):
+                return idx
+        return None
+
+
+@lru_cache(maxsize=CONDITION_CACHE_SIZE)
+def get_rule_index(conditions: Tuple[str, ...]) -> RuleIndex:
+    """
+    Devuelve el índice de reglas para una secuencia de condiciones (cacheado).
+
+    Args:
+        conditions: Tupla con las condiciones de las reglas de un bloque
+
+    Returns:
+        RuleIndex reutilizable
+    """
+    return RuleIndex(conditions, truth_table=_truth_tables.get(conditions))
+
+
+# ==============================================================================
+# TABLAS DE VERDAD PRECOMPILADAS
+# ==============================================================================
+
+# Máximo de combinaciones que se enumeran para un bloque
+MAX_TRUTH_TABLE_ROWS = 100_000
+
+# Resultado de TruthTable.lookup cuando el contexto no está en la tabla
+TABLE_MISS = object()
+
+# Condiciones de un bloque -> tabla de verdad registrada
+_truth_tables: Dict[Tuple[str, ...], 'TruthTable'] = {}
+
+
+class TruthTable:
+    """
+    Tabla precalculada (valores de las variables) -> primera regla que coincide.
+
+    Se construye enumerando todas las combinaciones de los valores posibles
+    de las variables que leen las reglas de un bloque (más None, variable
+    ausente). Elegir la regla es entonces una búsqueda en un diccionario.
+    Un contexto con algún valor fuera de la tabla devuelve TABLE_MISS y se
+    evalúa con normalidad.
+    """
+
+    __slots__ = ('conditions', 'variables', 'rules')
+
+    def __init__(self, conditions: Tuple[str, ...], variables: Tuple[str, ...],
+                 rules: Dict[Tuple[Any, ...], Optional[int]]):
+        """
+        Args:
+            conditions: Condiciones de las reglas del bloque, en orden
+            variables: Variables que leen las condiciones (orden de las claves)
+            rules: Valores de las variables -> índice de la regla (o None)
+        """
+        self.conditions = conditions
+        self.variables = variables
+        self.rules = rules
+
+    def lookup(self, context: Dict[str, Any]) -> Any:
+        """
+        Busca la regla que corresponde a un contexto.
+
+        Args:
+            context: Contexto con variables
+
+        Returns:
+            Índice de la regla, None si ninguna coincide, o TABLE_MISS si
+            la combinación de valores no está en la tabla
+        """
+        try:
+            return self.rules.get(tuple(context.get(var) for var in self.variables), TABLE_MISS)
+        except TypeError:
+            # Algún valor no es hashable
+            return TABLE_MISS
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def compile_truth_table(conditions: Sequence[str],
+                        domains: Dict[str, Sequence[Any]],
+                        max_rows: int = MAX_TRUTH_TABLE_ROWS) -> Optional[TruthTable]:
+    """
+    Enumera las combinaciones de valores de un bloque y precalcula su regla.
+
+    Cada condición se limita a sus propias variables (get_variables_in_expression),
+    así que la tabla solo crece con las variables que lee el bloque.
+
+    Args:
+        conditions: Condiciones de las reglas del bloque, en orden
+        domains: Variable -> valores posibles (opciones de radio/select)
+        max_rows: Máximo de combinaciones a enumerar
+
+    Returns:
+        TruthTable, o None si alguna variable no tiene dominio enumerado,
+        el bloque no lee ninguna variable o hay demasiadas combinaciones
+    """
+    conditions = tuple(conditions)
+    variables = tuple(sorted({
+        var for condition in conditions for var in get_variables_in_expression(condition)
+    }))
+    if not variables or any(var not in domains for var in variables):
+        return None
+
+    values = [list(domains[var]) + [None] for var in variables]
+    n_rows = 1
+    for options in values:
+        n_rows *= len(options)
+    if n_rows > max_rows:
+        return None
+
+    # Índice sin tabla: evaluación normal de cada combinación
+    index = RuleIndex(conditions)
+    rules = {
+        combination: index.select(dict(zip(variables, combination)))
+        for combination in itertools.product(*values)
+    }
+    return TruthTable(conditions, variables, rules)
+
+
+def register_truth_table(table: TruthTable) -> None:
+    """
+    Registra una tabla de verdad para que RuleIndex la use en sus búsquedas.
+
+    Args:
+        table: Tabla precompilada (ver compile_truth_table)
+    """
+    _truth_tables[table.conditions] = table
+    get_rule_index(table.conditions).truth_table = table
+
+
+def clear_truth_tables() -> None:
+    """Descarta las tablas de verdad registradas (se vuelve a evaluar regla a regla)."""
+    for conditions in list(_truth_tables):
+        get_rule_index(conditions).truth_table = None
+    _truth_tables.clear()
+
+
 # ==============================================================================
 # PROCESAMIENTO DE BLOQUES DE TEXTO
 # ==============================================================================
@@ -278,10 +1142,13 @@ def evaluate_block(block: BlockDefinition, context: Dict[str, Any]) -> Optional[
     Returns:
         Plantilla (string) de la regla que coincidió, o None si ninguna coincide
     """
-    for rule in block.reglas:
-        if evaluate_condition(rule.cuando, context):
-            logger.debug(f"Bloque '{block.id}': condición '{rule.cuando}' = True")
-            return rule.plantilla
+    index = get_rule_index(tuple(rule.cuando for rule in block.reglas))
+    rule_idx = index.select(context)
+
+    if rule_idx is not None:
+        rule = block.reglas[rule_idx]
+        logger.debug(f"Bloque '{block.id}': condición '{rule.cuando}' = True")
+        return rule.plantilla
 
     logger.debug(f"Bloque '{block.id}': ninguna condición coincidió")
     return None
@@ -312,6 +1179,38 @@ def evaluate_all_blocks(blocks: List[BlockDefinition],
     return results
 
 
+def evaluate_all_blocks_batch(blocks: List[BlockDefinition],
+                              contexts: Sequence[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Evalúa todos los bloques de texto para muchos contextos a la vez.
+
+    Pensado para lotes y análisis "what-if": con NumPy instalado, la regla de
+    cada bloque se elige para todo el lote con unas pocas operaciones sobre
+    arrays en lugar de evaluar cada regla en cada contexto. Sin NumPy se usa
+    evaluate_all_blocks contexto a contexto. El resultado es el mismo.
+
+    Args:
+        blocks: Lista de definiciones de bloques
+        contexts: Lista de contextos
+
+    Returns:
+        Lista de diccionarios {block_id: plantilla_seleccionada}, uno por contexto
+    """
+    if not numpy_available():
+        return [evaluate_all_blocks(blocks, context) for context in contexts]
+
+    columns = ContextColumns(contexts)
+    results: List[Dict[str, str]] = [{} for _ in contexts]
+
+    for block in blocks:
+        index = get_rule_index(tuple(rule.cuando for rule in block.reglas))
+        for result, rule_idx in zip(results, index.select_batch(columns)):
+            plantilla = block.reglas[rule_idx].plantilla if rule_idx is not None else None
+            result[block.id] = plantilla if plantilla is not None else ""
+
+    return results
+
+
 # ==============================================================================
 # VALIDACIÓN DE EXPRESIONES
 # ==============================================================================
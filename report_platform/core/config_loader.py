@@ -3,12 +3,29 @@ Config Loader - Carga de configuración desde YAML
 
 Funciones para cargar y parsear archivos de configuración YAML,
 incluyendo manifests, definiciones de campos y bloques de texto.
+
+Los objetos ya validados se guardan en una caché de proceso por archivo
+(mtime, tamaño y hash SHA-256): mientras un archivo no cambie, todas las
+llamadas (y todas las sesiones de Streamlit) comparten los mismos objetos y
+solo se vuelven a parsear los archivos modificados.
+
+Además, load_plugin_config guarda una instantánea binaria (pickle) de la
+configuración validada en el directorio de caché del usuario, fuera del
+árbol del plugin (ver get_cache_dir). Un proceso nuevo la carga en
+milisegundos en lugar de parsear y validar los YAML, siempre que el hash de
+todos los archivos fuente coincida.
 """
 
-import yaml
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import pydantic
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from report_platform.core.utils import setup_logger
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from report_platform.core.utils import setup_logger, load_yaml
 from report_platform.core.schema_models import (
     Manifest,
     SimpleField,
@@ -21,6 +38,287 @@ from report_platform.core.schema_models import (
 logger = setup_logger(__name__)
 
 
+# ==============================================================================
+# CACHÉ DE ARCHIVOS PARSEADOS
+# ==============================================================================
+
+class _CachedFile:
+    """YAML parseado de un archivo, su firma en disco y los objetos derivados."""
+    __slots__ = ('mtime_ns', 'size', 'digest', 'data', 'derived')
+
+    def __init__(self, mtime_ns: int, size: int, digest: str, data: Any):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.data = data
+        # tipo de parseo -> valor validado
+        self.derived: Dict[str, Any] = {}
+
+
+# archivo -> _CachedFile
+_file_cache: Dict[Path, _CachedFile] = {}
+# plugin_dir -> configuración completa ensamblada
+_plugin_configs: Dict[Path, Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+# Se incrementa cada vez que se parsea un YAML o se valida un objeto derivado
+_parse_count = 0
+
+
+def _parse_yaml_bytes(raw: bytes, filepath: Path) -> Optional[Dict[str, Any]]:
+    """Parsea el contenido de un YAML; devuelve None (y registra el error) si falla."""
+    try:
+        data = load_yaml(raw)
+        logger.debug(f"YAML cargado: {filepath.name}")
+        return data
+    except Exception as e:
+        logger.error(f"Error cargando YAML {filepath}: {e}")
+        return None
+
+
+def _get_cached_file(filepath: Path) -> Optional[_CachedFile]:
+    """
+    Devuelve la entrada de caché de un archivo, actualizándola si cambió.
+
+    Si el mtime y el tamaño no han cambiado no se lee el archivo. Si han
+    cambiado pero el contenido (hash) es el mismo, se conserva la entrada.
+    Solo se vuelve a parsear el YAML cuando cambia el contenido.
+
+    Returns:
+        _CachedFile o None si el archivo no existe
+    """
+    key = filepath.resolve()
+
+    try:
+        stat = filepath.stat()
+    except OSError:
+        _file_cache.pop(key, None)
+        return None
+
+    entry = _file_cache.get(key)
+    if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+        return entry
+
+    raw = filepath.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    if entry is not None and entry.digest == digest:
+        entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+        return entry
+
+    global _parse_count
+    entry = _CachedFile(stat.st_mtime_ns, stat.st_size, digest, _parse_yaml_bytes(raw, filepath))
+    with _cache_lock:
+        _file_cache[key] = entry
+        _parse_count += 1
+
+    return entry
+
+
+def _load_cached(filepath: Path, kind: str,
+                 parse: Callable[[Optional[Dict[str, Any]], Path], Any]) -> Any:
+    """
+    Carga un archivo YAML y lo transforma con ``parse``, usando la caché.
+
+    Args:
+        filepath: Archivo YAML
+        kind: Tipo de parseo (un mismo archivo puede transformarse de varias formas)
+        parse: Función (datos_yaml, filepath) -> valor validado
+
+    Returns:
+        Valor devuelto por ``parse`` (compartido entre llamadas)
+    """
+    global _parse_count
+    entry = _get_cached_file(filepath)
+    if entry is None:
+        return parse(load_yaml_config(filepath), filepath)
+
+    if kind not in entry.derived:
+        entry.derived[kind] = parse(entry.data, filepath)
+        _parse_count += 1
+
+    return entry.derived[kind]
+
+
+# ==============================================================================
+# INSTANTÁNEA BINARIA DE LA CONFIGURACIÓN
+# ==============================================================================
+
+# Variable de entorno para usar otro directorio de caché
+CACHE_DIR_ENV_VAR = "REPORT_CACHE_DIR"
+
+SNAPSHOT_PREFIX = "config_snapshot_"
+
+# Cambiar al modificar el formato de la instantánea o de los modelos
+SNAPSHOT_VERSION = 1
+
+
+def get_cache_dir() -> Path:
+    """
+    Obtiene (y crea si no existe) el directorio de caché del usuario.
+
+    Por defecto ``$XDG_CACHE_HOME/report_platform`` (``~/.cache`` si no está
+    definida; ``%LOCALAPPDATA%`` en Windows). Se crea solo con permisos para
+    el usuario.
+
+    Returns:
+        Path al directorio de caché
+    """
+    env_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if env_dir:
+        cache_dir = Path(env_dir).resolve()
+    else:
+        base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else os.environ.get('XDG_CACHE_HOME')
+        cache_dir = Path(base or Path.home() / ".cache") / "report_platform"
+
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _snapshot_path(plugin_dir: Path) -> Path:
+    """Archivo de la instantánea de un plugin (uno por ruta de plugin)."""
+    key = hashlib.sha256(str(plugin_dir.resolve()).encode('utf-8')).hexdigest()[:16]
+    return get_cache_dir() / f"{SNAPSHOT_PREFIX}{plugin_dir.name}_{key}.pickle"
+
+
+def _is_private(path: Path) -> bool:
+    """
+    Indica si solo el usuario actual puede modificar un archivo.
+
+    La instantánea es un pickle: no se carga si pertenece a otro usuario o
+    si otros usuarios pueden escribir en ella o en su directorio.
+    """
+    if not hasattr(os, 'getuid'):
+        return True
+    for item in (path, path.parent):
+        stat = item.stat()
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+            return False
+    return True
+
+
+def _snapshot_environment() -> Tuple[int, str, str]:
+    """Versión de formato, de Python y de Pydantic con la que se crea la instantánea."""
+    return (SNAPSHOT_VERSION, f"{sys.version_info[0]}.{sys.version_info[1]}", pydantic.VERSION)
+
+
+def _snapshot_sources(plugin_dir: Path, config_dir: Path) -> List[Path]:
+    """Archivos YAML de un plugin que forman parte de la instantánea."""
+    names = ("variables_simples.yaml", "variables_condicionales.yaml",
+             "bloques_texto.yaml", "tablas.yaml")
+    return [plugin_dir / "manifest.yaml"] + [config_dir / name for name in names]
+
+
+def _write_snapshot(plugin_dir: Path, config_dir: Path) -> None:
+    """
+    Escribe la instantánea de la configuración cacheada de un plugin.
+
+    Incluye, por cada archivo fuente, su hash, el YAML parseado y los objetos
+    validados. La escritura es atómica (temporal + os.replace); si falla
+    (p. ej. directorio de solo lectura) solo se registra un aviso.
+    """
+    sources: Dict[str, str] = {}
+    files: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+
+    for filepath in _snapshot_sources(plugin_dir, config_dir):
+        entry = _file_cache.get(filepath.resolve())
+        if entry is None:
+            continue
+        name = os.path.relpath(filepath, plugin_dir)
+        sources[name] = entry.digest
+        files[name] = (entry.data, dict(entry.derived))
+
+    tmp_name = None
+    snapshot_path = None
+    try:
+        snapshot_path = _snapshot_path(plugin_dir)
+        payload = pickle.dumps(files, protocol=pickle.HIGHEST_PROTOCOL)
+        snapshot = {
+            'environment': _snapshot_environment(),
+            'sources': sources,
+            'checksum': hashlib.sha256(payload).hexdigest(),
+            'payload': payload,
+        }
+
+        fd, tmp_name = tempfile.mkstemp(prefix=snapshot_path.name + ".", dir=snapshot_path.parent)
+        with open(fd, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, snapshot_path)
+
+        logger.debug(f"Instantánea de configuración guardada: {snapshot_path}")
+
+    except Exception as e:
+        if tmp_name:
+            Path(tmp_name).unlink(missing_ok=True)
+        logger.warning(f"No se pudo guardar la instantánea de configuración {snapshot_path}: {e}")
+
+
+def _load_snapshot(plugin_dir: Path) -> bool:
+    """
+    Carga la instantánea de un plugin en la caché de archivos.
+
+    Se descarta (y se usarán los YAML) si otros usuarios pueden modificarla,
+    si cambia la versión de formato, de Python o de Pydantic, si el checksum
+    no coincide o si el hash de algún archivo fuente es distinto.
+
+    Returns:
+        True si se cargó la instantánea
+    """
+    try:
+        snapshot_path = _snapshot_path(plugin_dir)
+        if not snapshot_path.exists():
+            return False
+        if not _is_private(snapshot_path):
+            logger.warning(f"Instantánea de configuración ignorada (modificable por otros usuarios): {snapshot_path}")
+            return False
+    except OSError as e:
+        logger.warning(f"No se pudo acceder a la caché de configuración: {e}")
+        return False
+
+    try:
+        with open(snapshot_path, 'rb') as f:
+            snapshot = pickle.load(f)
+
+        if snapshot.get('environment') != _snapshot_environment():
+            logger.info(f"Instantánea de configuración obsoleta (versión): {snapshot_path}")
+            return False
+
+        payload = snapshot['payload']
+        if hashlib.sha256(payload).hexdigest() != snapshot['checksum']:
+            logger.warning(f"Instantánea de configuración corrupta: {snapshot_path}")
+            return False
+
+        entries = {}
+        for name, digest in snapshot['sources'].items():
+            filepath = plugin_dir / name
+            raw = filepath.read_bytes()
+            if hashlib.sha256(raw).hexdigest() != digest:
+                logger.info(f"Instantánea de configuración obsoleta ({name} ha cambiado)")
+                return False
+            stat = filepath.stat()
+            entries[name] = (filepath.resolve(), _CachedFile(stat.st_mtime_ns, len(raw), digest, None))
+
+        files = pickle.loads(payload)
+
+    except Exception as e:
+        logger.warning(f"No se pudo cargar la instantánea de configuración {snapshot_path}: {e}")
+        return False
+
+    with _cache_lock:
+        for name, (key, entry) in entries.items():
+            entry.data, entry.derived = files[name]
+            _file_cache[key] = entry
+
+    logger.info(f"Configuración cargada desde instantánea: {snapshot_path}")
+    return True
+
+
+def clear_config_cache() -> None:
+    """Vacía la caché de configuración (fuerza releer todos los YAML)."""
+    with _cache_lock:
+        _file_cache.clear()
+        _plugin_configs.clear()
+
+
 # ==============================================================================
 # CARGA DE MANIFEST
 # ==============================================================================
@@ -41,16 +339,18 @@ def load_manifest(plugin_dir: Path) -> Optional[Manifest]:
         logger.error(f"No se encontró manifest.yaml en {plugin_dir}")
         return None
     
+    return _load_cached(manifest_path, 'manifest', _parse_manifest)
+
+
+def _parse_manifest(data: Optional[Dict[str, Any]], manifest_path: Path) -> Optional[Manifest]:
+    """Valida el contenido de un manifest.yaml."""
     try:
-        with open(manifest_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        
         manifest = validate_manifest_dict(data)
         logger.info(f"Manifest cargado: {manifest.nombre} (v{manifest.version})")
         return manifest
     
     except Exception as e:
-        logger.error(f"Error cargando manifest de {plugin_dir}: {e}")
+        logger.error(f"Error cargando manifest de {manifest_path.parent}: {e}")
         return None
 
 
@@ -74,7 +374,7 @@ def load_yaml_config(filepath: Path) -> Optional[Dict[str, Any]]:
     
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+            data = load_yaml(f)
         
         logger.debug(f"YAML cargado: {filepath.name}")
         return data
@@ -99,8 +399,11 @@ def load_simple_fields(config_dir: Path) -> List[SimpleField]:
         Lista de SimpleField
     """
     filepath = config_dir / "variables_simples.yaml"
-    data = load_yaml_config(filepath)
-    
+    return _load_cached(filepath, 'simple_fields', _parse_simple_fields)
+
+
+def _parse_simple_fields(data: Optional[Dict[str, Any]], filepath: Path) -> List[SimpleField]:
+    """Valida las variables_simples de un archivo ya parseado."""
     if not data or 'variables_simples' not in data:
         logger.warning(f"No se encontraron variables_simples en {filepath}")
         return []
@@ -132,8 +435,12 @@ def load_conditional_variables(config_dir: Path) -> List[ConditionalVariable]:
         Lista de ConditionalVariable
     """
     filepath = config_dir / "variables_condicionales.yaml"
-    data = load_yaml_config(filepath)
-    
+    return _load_cached(filepath, 'conditional_variables', _parse_conditional_variables)
+
+
+def _parse_conditional_variables(data: Optional[Dict[str, Any]],
+                                 filepath: Path) -> List[ConditionalVariable]:
+    """Valida las variables_condicionales de un archivo ya parseado."""
     if not data or 'variables_condicionales' not in data:
         logger.warning(f"No se encontraron variables_condicionales en {filepath}")
         return []
@@ -165,8 +472,11 @@ def load_text_blocks(config_dir: Path) -> List[BlockDefinition]:
         Lista de BlockDefinition
     """
     filepath = config_dir / "bloques_texto.yaml"
-    data = load_yaml_config(filepath)
-    
+    return _load_cached(filepath, 'text_blocks', _parse_text_blocks)
+
+
+def _parse_text_blocks(data: Optional[Dict[str, Any]], filepath: Path) -> List[BlockDefinition]:
+    """Valida los bloques_texto de un archivo ya parseado."""
     if not data or 'bloques_texto' not in data:
         logger.warning(f"No se encontraron bloques_texto en {filepath}")
         return []
@@ -198,8 +508,11 @@ def load_tables(config_dir: Path) -> List[TableDefinition]:
         Lista de TableDefinition
     """
     filepath = config_dir / "tablas.yaml"
-    data = load_yaml_config(filepath)
-    
+    return _load_cached(filepath, 'tables', _parse_tables)
+
+
+def _parse_tables(data: Optional[Dict[str, Any]], filepath: Path) -> List[TableDefinition]:
+    """Valida las tablas de un archivo ya parseado."""
     if not data or 'tablas' not in data:
         logger.debug(f"No se encontraron definiciones de tablas en {filepath}")
         return []
@@ -224,12 +537,25 @@ def load_plugin_config(plugin_dir: Path) -> Optional[Dict[str, Any]]:
     """
     Carga toda la configuración de un plugin.
     
+    Cada archivo se obtiene de la caché, así que solo se parsean los que han
+    cambiado. Se devuelve un diccionario nuevo en cada llamada (el llamador
+    puede añadir claves), pero los objetos que contiene son compartidos y no
+    deben modificarse.
+    
     Args:
         plugin_dir: Directorio del plugin
     
     Returns:
         Diccionario con toda la configuración o None si hay error
     """
+    key = plugin_dir.resolve()
+    
+    # Primera carga en este proceso: intentar la instantánea binaria
+    if key not in _plugin_configs:
+        _load_snapshot(plugin_dir)
+    
+    parse_count = _parse_count
+    
     # Cargar manifest
     manifest = load_manifest(plugin_dir)
     if not manifest:
@@ -251,10 +577,25 @@ def load_plugin_config(plugin_dir: Path) -> Optional[Dict[str, Any]]:
         'conditional_variables': load_conditional_variables(config_dir),
         'text_blocks': load_text_blocks(config_dir),
         'tables': load_tables(config_dir),
+        'general_config': get_general_config(config_dir),
+        'date_group_labels': get_date_group_labels(config_dir),
     }
     
+    # Si ningún componente ha cambiado se reutiliza la configuración anterior
+    previous = _plugin_configs.get(key)
+    if previous is not None and all(previous[k] is v for k, v in config.items()
+                                     if k not in ('plugin_dir', 'config_dir')):
+        return dict(previous)
+    
+    with _cache_lock:
+        _plugin_configs[key] = config
+    
+    # Actualizar la instantánea si se ha tenido que parsear algún YAML
+    if _parse_count != parse_count:
+        _write_snapshot(plugin_dir, config_dir)
+    
     logger.info(f"Configuración completa cargada para plugin: {manifest.id}")
-    return config
+    return dict(config)
 
 
 # ==============================================================================
@@ -272,14 +613,45 @@ def get_general_config(config_dir: Path) -> Dict[str, Any]:
         Diccionario con configuración general
     """
     filepath = config_dir / "variables_simples.yaml"
-    data = load_yaml_config(filepath)
-    
+    return _load_cached(filepath, 'general_config', _parse_general_config)
+
+
+def _parse_general_config(data: Optional[Dict[str, Any]], filepath: Path) -> Dict[str, Any]:
+    """Extrae la sección 'configuracion' de un archivo ya parseado."""
     if data and 'configuracion' in data:
         return data['configuracion']
     
     return {}
 
 
+def get_date_group_labels(config_dir: Path) -> Dict[str, str]:
+    """
+    Obtiene las etiquetas de los grupos de fecha (agrupaciones_fecha).
+    
+    Args:
+        config_dir: Directorio de configuración
+    
+    Returns:
+        Diccionario {grupo: etiqueta}
+    """
+    filepath = config_dir / "variables_simples.yaml"
+    return _load_cached(filepath, 'date_group_labels', _parse_date_group_labels)
+
+
+def _parse_date_group_labels(data: Optional[Dict[str, Any]], filepath: Path) -> Dict[str, str]:
+    """Resuelve la etiqueta de cada grupo de fecha de un archivo ya parseado."""
+    general_config = _parse_general_config(data, filepath)
+    labels: Dict[str, str] = {}
+    
+    for agrupacion in general_config.get('agrupaciones_fecha', []) or []:
+        group_name = agrupacion.get('grupo')
+        # Como antes, la primera agrupación con ese nombre tiene prioridad
+        if group_name and group_name not in labels:
+            labels[group_name] = agrupacion.get('etiqueta', group_name)
+    
+    return labels
+
+
 # ==============================================================================
 # ORDENAMIENTO DE CAMPOS POR SECCIÓN
 # ==============================================================================
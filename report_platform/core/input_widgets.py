@@ -11,10 +11,11 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Any, Optional
 
-import streamlit as st
-
 from report_platform.core.schema_models import SimpleField
-from report_platform.core.utils import setup_logger
+from report_platform.core.utils import setup_logger, lazy_import
+
+# Streamlit se carga en el primer uso de un widget
+st = lazy_import("streamlit")
 
 logger = setup_logger(__name__)
 
@@ -3,16 +3,46 @@ Metadata - Gestión de metadatos de informes generados
 
 Este módulo permite guardar y recuperar metadatos de los informes generados,
 facilitando la reproducción y modificación de informes anteriores.
+
+El almacenamiento es intercambiable (variable de entorno
+REPORT_METADATA_BACKEND):
+
+- 'sqlite' (por defecto): base de datos metadata/metadata.db con índices
+  por id, report_id y timestamp; las consultas por ID y las páginas de
+  "últimos N" no dependen del tamaño del historial.
+- 'jsonl': log JSON-lines de solo adición (metadata/metadata.jsonl): cada
+  informe añade una línea y cada borrado añade una marca {"_deleted": id}.
+  compact_metadata() reescribe el archivo sin los registros borrados.
+
+El formato anterior ({'reports': [...]} en metadata.json) se migra
+automáticamente la primera vez.
+
+Varias sesiones (o procesos) pueden escribir a la vez: las operaciones sobre
+archivos se serializan con un bloqueo advisory (metadata/.metadata.lock) y
+las reescrituras usan archivo temporal + os.replace. El directorio puede
+cambiarse con la variable de entorno REPORT_METADATA_DIR.
 """
 
 import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 
 from report_platform.core.utils import setup_logger
 
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
 logger = setup_logger(__name__)
 
 
@@ -47,6 +77,10 @@ class ReportMetadata(BaseModel):
 # CONFIGURACIÓN DE PATHS
 # ==============================================================================
 
+# Variable de entorno para cambiar el directorio de metadatos
+METADATA_DIR_ENV_VAR = "REPORT_METADATA_DIR"
+
+
 def get_metadata_dir() -> Path:
     """
     Obtiene el directorio donde se guardan los metadatos.
@@ -54,56 +88,504 @@ def get_metadata_dir() -> Path:
     Returns:
         Path al directorio de metadatos
     """
-    # Usar directorio en la raíz del proyecto
-    metadata_dir = Path(__file__).resolve().parents[2] / "metadata"
+    # Directorio configurado o, por defecto, en la raíz del proyecto
+    env_dir = os.environ.get(METADATA_DIR_ENV_VAR)
+    if env_dir:
+        metadata_dir = Path(env_dir).resolve()
+    else:
+        metadata_dir = Path(__file__).resolve().parents[2] / "metadata"
 
     # Crear directorio si no existe
-    metadata_dir.mkdir(exist_ok=True)
+    metadata_dir.mkdir(parents=True, exist_ok=True)
 
     return metadata_dir
 
 
 def get_metadata_file() -> Path:
     """
-    Obtiene el path del archivo JSON de metadatos.
+    Obtiene el path del log JSON-lines de metadatos.
 
     Returns:
-        Path al archivo metadata.json
+        Path al archivo metadata.jsonl
+    """
+    return get_metadata_dir() / "metadata.jsonl"
+
+
+def get_legacy_metadata_file() -> Path:
+    """
+    Obtiene el path del archivo de metadatos en el formato anterior.
+
+    Returns:
+        Path al archivo metadata.json ({'reports': [...]})
     """
     return get_metadata_dir() / "metadata.json"
 
 
 # ==============================================================================
-# FUNCIONES DE PERSISTENCIA
+# BLOQUEO ENTRE PROCESOS
 # ==============================================================================
 
-def save_metadata(meta: ReportMetadata) -> None:
+# Tiempo máximo de espera por el bloqueo y pausa inicial entre reintentos
+LOCK_TIMEOUT = 30.0
+LOCK_RETRY_DELAY = 0.005
+LOCK_MAX_RETRY_DELAY = 0.2
+
+
+def _try_lock(f) -> None:
+    """Intenta bloquear el archivo sin esperar; lanza OSError si está ocupado."""
+    if os.name == 'nt':
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _unlock(f) -> None:
+    """Libera el bloqueo del archivo."""
+    if os.name == 'nt':
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def metadata_lock(timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
     """
-    Guarda un registro de metadata al archivo JSON.
+    Bloqueo exclusivo entre procesos (e hilos) sobre el directorio de metadatos.
 
-    Si el archivo existe, agrega el nuevo registro a la lista existente.
-    Si no existe, crea el archivo con el primer registro.
+    El bloqueo se reintenta con espera exponencial acotada hasta agotar
+    ``timeout``. No es reentrante: no debe anidarse.
 
     Args:
-        meta: Metadatos del informe a guardar
+        timeout: Segundos máximos de espera
+
+    Raises:
+        TimeoutError: Si no se obtiene el bloqueo a tiempo
     """
-    metadata_file = get_metadata_file()
+    lock_file = get_metadata_dir() / ".metadata.lock"
+    deadline = time.monotonic() + timeout
+    delay = LOCK_RETRY_DELAY
+
+    with open(lock_file, 'a+b') as f:
+        while True:
+            try:
+                _try_lock(f)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"No se pudo bloquear {lock_file} en {timeout}s")
+                time.sleep(delay)
+                delay = min(delay * 2, LOCK_MAX_RETRY_DELAY)
+
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+# ==============================================================================
+# LOG JSON-LINES
+# ==============================================================================
+
+# Clave de las líneas que marcan un registro como eliminado
+DELETED_KEY = "_deleted"
+
+
+def _append_lines(metadata_file: Path, entries: List[Dict[str, Any]]) -> None:
+    """
+    Añade entradas al final del log y fuerza su escritura a disco (fsync).
+
+    Si la última línea quedó incompleta (p. ej. por una caída a mitad de
+    escritura), se empieza en una línea nueva para no corromper la entrada.
+    Debe llamarse con metadata_lock() adquirido.
+    """
+    payload = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
 
+    with open(metadata_file, 'ab+') as f:
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                payload = "\n" + payload
+        f.write(payload.encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_records(metadata_file: Path) -> List[Dict[str, Any]]:
+    """
+    Lee el log y devuelve los registros vigentes (sin los eliminados).
+
+    Las líneas corruptas se ignoran con un aviso.
+    """
+    if not metadata_file.exists():
+        return []
+
+    entries = []
+    last_deletion: Dict[str, int] = {}
+
+    with open(metadata_file, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Línea {line_no} de {metadata_file.name} corrupta, se ignora")
+                continue
+
+            if DELETED_KEY in entry:
+                last_deletion[entry[DELETED_KEY]] = len(entries)
+            else:
+                entries.append(entry)
+
+    # Un registro está eliminado si hay una marca posterior con su id
+    return [
+        entry for pos, entry in enumerate(entries)
+        if last_deletion.get(entry.get('id'), -1) < pos
+    ]
+
+
+def _write_records(metadata_file: Path, records: List[Dict[str, Any]]) -> None:
+    """
+    Reescribe el log completo de forma atómica (archivo temporal + replace).
+
+    Debe llamarse con metadata_lock() adquirido.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=metadata_file.name + ".", suffix=".tmp",
+                                    dir=metadata_file.parent)
     try:
-        # Leer metadatos existentes
-        if metadata_file.exists():
+        with open(fd, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_name, metadata_file)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def migrate_legacy_metadata() -> int:
+    """
+    Migra metadata.json ({'reports': [...]}) al log JSON-lines.
+
+    Solo actúa si existe el archivo antiguo y todavía no existe el nuevo.
+    El archivo antiguo se conserva renombrado como metadata.json.bak.
+
+    Returns:
+        Número de registros migrados
+    """
+    legacy_file = get_legacy_metadata_file()
+    metadata_file = get_metadata_file()
+
+    if not legacy_file.exists() or metadata_file.exists():
+        return 0
+
+    with metadata_lock():
+        # Otro proceso pudo migrar mientras se esperaba el bloqueo
+        if not legacy_file.exists() or metadata_file.exists():
+            return 0
+
+        with open(legacy_file, 'r', encoding='utf-8') as f:
+            records = json.load(f).get('reports', [])
+
+        _write_records(metadata_file, records)
+        os.replace(legacy_file, legacy_file.with_name(legacy_file.name + ".bak"))
+
+    logger.info(f"Migrados {len(records)} registros de {legacy_file.name} a {metadata_file.name}")
+    return len(records)
+
+
+def _get_metadata_log() -> Path:
+    """Devuelve el log de metadatos, migrando el formato antiguo si hace falta."""
+    migrate_legacy_metadata()
+    return get_metadata_file()
+
+
+# ==============================================================================
+# BACKENDS DE ALMACENAMIENTO
+# ==============================================================================
+
+BACKEND_SQLITE = 'sqlite'
+BACKEND_JSONL = 'jsonl'
+DEFAULT_BACKEND = BACKEND_SQLITE
+
+# Variable de entorno para elegir el backend
+BACKEND_ENV_VAR = "REPORT_METADATA_BACKEND"
+
+
+class MetadataStore(ABC):
+    """
+    Interfaz común de los backends de metadatos.
+
+    Las subclases deben implementar save, load_all y delete. Las consultas
+    restantes tienen una implementación genérica sobre load_all que los
+    backends indexados sustituyen por consultas directas.
+    """
+
+    @abstractmethod
+    def save(self, meta: ReportMetadata) -> None:
+        """Guarda un registro."""
+
+    @abstractmethod
+    def load_all(self) -> List[ReportMetadata]:
+        """Todos los registros, del más reciente al más antiguo."""
+
+    @abstractmethod
+    def delete(self, metadata_id: str) -> bool:
+        """Elimina un registro; False si no existía."""
+
+    def load_latest(self, limit: int, offset: int = 0,
+                    report_id: Optional[str] = None) -> List[ReportMetadata]:
+        """Página de registros más recientes, opcionalmente de un report_id."""
+        records = self.load_all()
+        if report_id is not None:
+            records = [m for m in records if m.report_id == report_id]
+        return records[offset:offset + limit]
+
+    def load_by_id(self, metadata_id: str) -> Optional[ReportMetadata]:
+        return next((m for m in self.load_all() if m.id == metadata_id), None)
+
+    def count(self, report_id: Optional[str] = None) -> int:
+        records = self.load_all()
+        if report_id is not None:
+            records = [m for m in records if m.report_id == report_id]
+        return len(records)
+
+    def report_ids(self) -> List[str]:
+        """IDs de informe con al menos un registro, ordenados."""
+        return sorted({m.report_id for m in self.load_all()})
+
+    def compact(self) -> int:
+        """Libera el espacio de los registros eliminados."""
+        return 0
+
+
+class JsonlMetadataStore(MetadataStore):
+    """Backend sobre el log JSON-lines de solo adición."""
+
+    def save(self, meta: ReportMetadata) -> None:
+        metadata_file = _get_metadata_log()
+        with metadata_lock():
+            _append_lines(metadata_file, [meta.model_dump()])
+
+    def load_all(self) -> List[ReportMetadata]:
+        records = [ReportMetadata(**record) for record in _read_records(_get_metadata_log())]
+        records.sort(key=lambda m: m.timestamp, reverse=True)
+        return records
+
+    def delete(self, metadata_id: str) -> bool:
+        metadata_file = _get_metadata_log()
+
+        with metadata_lock():
+            records = _read_records(metadata_file)
+            if not any(r.get('id') == metadata_id for r in records):
+                return False
+
+            _append_lines(metadata_file, [{DELETED_KEY: metadata_id}])
+        return True
+
+    def compact(self) -> int:
+        metadata_file = _get_metadata_log()
+
+        with metadata_lock():
+            if not metadata_file.exists():
+                return 0
+
             with open(metadata_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                records = data.get('reports', [])
-        else:
-            records = []
+                total_lines = sum(1 for line in f if line.strip())
 
-        # Agregar nuevo registro
-        records.append(meta.model_dump())
+            records = _read_records(metadata_file)
+            _write_records(metadata_file, records)
 
-        # Escribir de vuelta
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump({'reports': records}, f, ensure_ascii=False, indent=2)
+        return total_lines - len(records)
+
+
+class SqliteMetadataStore(MetadataStore):
+    """
+    Backend SQLite indexado.
+
+    Cada registro se guarda como JSON en la columna 'data', junto con las
+    columnas indexadas por las que se consulta. Solo se validan con Pydantic
+    las filas devueltas. Se abre una conexión por operación, de modo que la
+    misma instancia es segura entre hilos (reruns de Streamlit) y procesos;
+    las escrituras concurrentes las serializa SQLite, que reintenta durante
+    BUSY_TIMEOUT segundos si la base de datos está bloqueada.
+    """
+
+    BUSY_TIMEOUT = LOCK_TIMEOUT
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS reports (
+            id TEXT PRIMARY KEY,
+            report_id TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_reports_timestamp ON reports (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_reports_report_id_timestamp
+            ON reports (report_id, timestamp);
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Abre (o crea) la base de datos.
+
+        Si la base de datos no existía, importa los registros del log
+        JSON-lines (y, a través de él, del metadata.json antiguo).
+
+        Args:
+            db_path: Path al archivo .db
+        """
+        self.db_path = db_path
+        log_file = _get_metadata_log()
+
+        # El bloqueo evita que dos procesos importen el historial a la vez
+        with metadata_lock():
+            is_new = not db_path.exists()
+
+            with self._connect() as conn:
+                conn.executescript(self._SCHEMA)
+
+            if is_new:
+                self._import_jsonl(log_file)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Conexión que confirma la transacción al salir y siempre se cierra."""
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _import_jsonl(self, log_file: Path) -> None:
+        """Importa el historial del log JSON-lines a la base de datos."""
+        records = _read_records(log_file)
+        if not records:
+            return
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO reports (id, report_id, timestamp, data) VALUES (?, ?, ?, ?)",
+                [(r['id'], r['report_id'], r['timestamp'], json.dumps(r, ensure_ascii=False))
+                 for r in records],
+            )
+        logger.info(f"Importados {len(records)} registros de metadata a {self.db_path.name}")
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[ReportMetadata]:
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [ReportMetadata(**json.loads(row[0])) for row in rows]
+
+    def save(self, meta: ReportMetadata) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (id, report_id, timestamp, data) VALUES (?, ?, ?, ?)",
+                (meta.id, meta.report_id, meta.timestamp,
+                 json.dumps(meta.model_dump(), ensure_ascii=False)),
+            )
+
+    def load_all(self) -> List[ReportMetadata]:
+        return self._query("SELECT data FROM reports ORDER BY timestamp DESC")
+
+    def delete(self, metadata_id: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM reports WHERE id = ?", (metadata_id,))
+        return cursor.rowcount > 0
+
+    def load_latest(self, limit: int, offset: int = 0,
+                    report_id: Optional[str] = None) -> List[ReportMetadata]:
+        if report_id is None:
+            return self._query(
+                "SELECT data FROM reports ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            )
+        return self._query(
+            "SELECT data FROM reports WHERE report_id = ? "
+            "ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+            (report_id, limit, offset),
+        )
+
+    def load_by_id(self, metadata_id: str) -> Optional[ReportMetadata]:
+        records = self._query("SELECT data FROM reports WHERE id = ?", (metadata_id,))
+        return records[0] if records else None
+
+    def count(self, report_id: Optional[str] = None) -> int:
+        with self._connect() as conn:
+            if report_id is None:
+                row = conn.execute("SELECT COUNT(*) FROM reports").fetchone()
+            else:
+                row = conn.execute("SELECT COUNT(*) FROM reports WHERE report_id = ?",
+                                   (report_id,)).fetchone()
+        return row[0]
+
+    def report_ids(self) -> List[str]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT report_id FROM reports ORDER BY report_id").fetchall()
+        return [row[0] for row in rows]
+
+    def compact(self) -> int:
+        with self._connect() as conn:
+            conn.execute("VACUUM")
+        return 0
+
+
+# Instancias por (backend, directorio de metadatos)
+_stores: Dict[Tuple[str, Path], MetadataStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_metadata_store(backend: Optional[str] = None) -> MetadataStore:
+    """
+    Obtiene el backend de metadatos configurado.
+
+    Args:
+        backend: 'sqlite' o 'jsonl' (por defecto, REPORT_METADATA_BACKEND o 'sqlite')
+
+    Returns:
+        Instancia de MetadataStore (compartida por proceso)
+    """
+    backend = backend or os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND
+    metadata_dir = get_metadata_dir()
+    key = (backend, metadata_dir)
+
+    store = _stores.get(key)
+    if store is not None:
+        return store
+
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            if backend == BACKEND_SQLITE:
+                store = SqliteMetadataStore(metadata_dir / "metadata.db")
+            elif backend == BACKEND_JSONL:
+                store = JsonlMetadataStore()
+            else:
+                raise ValueError(f"Backend de metadata desconocido: {backend}")
+            _stores[key] = store
+
+    return store
+
+
+# ==============================================================================
+# FUNCIONES DE PERSISTENCIA
+# ==============================================================================
+
+def save_metadata(meta: ReportMetadata) -> None:
+    """
+    Guarda un registro de metadata en el backend configurado.
+
+    Args:
+        meta: Metadatos del informe a guardar
+    """
+    try:
+        get_metadata_store().save(meta)
 
         logger.info(f"Metadata guardado: {meta.id} ({meta.report_name})")
 
@@ -114,30 +596,70 @@ def save_metadata(meta: ReportMetadata) -> None:
 
 def load_all_metadata() -> List[ReportMetadata]:
     """
-    Carga todos los registros de metadata del archivo JSON.
+    Carga todos los registros de metadata.
 
     Returns:
         Lista de ReportMetadata, ordenada por timestamp descendente (más reciente primero)
     """
-    metadata_file = get_metadata_file()
+    try:
+        metadata_list = get_metadata_store().load_all()
+
+        logger.info(f"Cargados {len(metadata_list)} registros de metadata")
+        return metadata_list
 
+    except Exception as e:
+        logger.error(f"Error cargando metadata: {e}")
+        return []
+
+
+def load_latest_metadata(limit: int = 20, offset: int = 0,
+                         report_id: Optional[str] = None) -> List[ReportMetadata]:
+    """
+    Carga una página de los registros más recientes.
+
+    Args:
+        limit: Número máximo de registros
+        offset: Registros a saltar (para paginar)
+        report_id: Si se indica, solo registros de ese tipo de informe
+
+    Returns:
+        Lista de ReportMetadata, del más reciente al más antiguo
+    """
     try:
-        if not metadata_file.exists():
-            logger.info("No se encontró archivo de metadata")
-            return []
+        return get_metadata_store().load_latest(limit, offset=offset, report_id=report_id)
 
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            records = data.get('reports', [])
+    except Exception as e:
+        logger.error(f"Error cargando metadata: {e}")
+        return []
 
-        # Parsear a modelos Pydantic
-        metadata_list = [ReportMetadata(**record) for record in records]
 
-        # Ordenar por timestamp descendente (más reciente primero)
-        metadata_list.sort(key=lambda m: m.timestamp, reverse=True)
+def count_metadata(report_id: Optional[str] = None) -> int:
+    """
+    Cuenta los registros de metadata.
 
-        logger.info(f"Cargados {len(metadata_list)} registros de metadata")
-        return metadata_list
+    Args:
+        report_id: Si se indica, solo cuenta los de ese tipo de informe
+
+    Returns:
+        Número de registros
+    """
+    try:
+        return get_metadata_store().count(report_id)
+
+    except Exception as e:
+        logger.error(f"Error contando metadata: {e}")
+        return 0
+
+
+def list_metadata_report_ids() -> List[str]:
+    """
+    Lista los tipos de informe que tienen metadatos guardados.
+
+    Returns:
+        Lista ordenada de report_id
+    """
+    try:
+        return get_metadata_store().report_ids()
 
     except Exception as e:
         logger.error(f"Error cargando metadata: {e}")
@@ -154,8 +676,8 @@ def load_metadata_by_report_id(report_id: str) -> List[ReportMetadata]:
     Returns:
         Lista de ReportMetadata filtrada por report_id
     """
-    all_metadata = load_all_metadata()
-    filtered = [m for m in all_metadata if m.report_id == report_id]
+    total = count_metadata(report_id)
+    filtered = load_latest_metadata(limit=total, report_id=report_id) if total else []
 
     logger.info(f"Encontrados {len(filtered)} registros para report_id '{report_id}'")
     return filtered
@@ -171,48 +693,35 @@ def load_metadata_by_id(metadata_id: str) -> Optional[ReportMetadata]:
     Returns:
         ReportMetadata si se encuentra, None en caso contrario
     """
-    all_metadata = load_all_metadata()
-
-    for meta in all_metadata:
-        if meta.id == metadata_id:
-            return meta
+    try:
+        meta = get_metadata_store().load_by_id(metadata_id)
+    except Exception as e:
+        logger.error(f"Error cargando metadata: {e}")
+        return None
 
-    logger.warning(f"No se encontró metadata con id '{metadata_id}'")
-    return None
+    if meta is None:
+        logger.warning(f"No se encontró metadata con id '{metadata_id}'")
+    return meta
 
 
 def delete_metadata_by_id(metadata_id: str) -> bool:
     """
     Elimina un registro de metadata por su ID.
 
+    Con el backend 'jsonl' el borrado añade una marca al log; el registro
+    desaparece físicamente del archivo al ejecutar compact_metadata().
+
     Args:
         metadata_id: ID único del registro a eliminar
 
     Returns:
         True si se eliminó, False si no se encontró
     """
-    metadata_file = get_metadata_file()
-
     try:
-        if not metadata_file.exists():
-            return False
-
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            records = data.get('reports', [])
-
-        # Filtrar el registro a eliminar
-        original_count = len(records)
-        records = [r for r in records if r.get('id') != metadata_id]
-
-        if len(records) == original_count:
+        if not get_metadata_store().delete(metadata_id):
             logger.warning(f"No se encontró metadata con id '{metadata_id}'")
             return False
 
-        # Escribir de vuelta
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump({'reports': records}, f, ensure_ascii=False, indent=2)
-
         logger.info(f"Metadata eliminado: {metadata_id}")
         return True
 
@@ -221,6 +730,22 @@ def delete_metadata_by_id(metadata_id: str) -> bool:
         return False
 
 
+def compact_metadata() -> int:
+    """
+    Libera el espacio de los registros eliminados.
+
+    Con el backend 'jsonl' reescribe el log de forma atómica (archivo
+    temporal + os.replace) sin registros eliminados ni líneas corruptas;
+    con 'sqlite' ejecuta VACUUM.
+
+    Returns:
+        Número de líneas descartadas del log (0 en SQLite)
+    """
+    removed = get_metadata_store().compact()
+    logger.info(f"Metadata compactado: {removed} líneas descartadas")
+    return removed
+
+
 # ==============================================================================
 # UTILIDADES
 # ==============================================================================
@@ -220,11 +220,12 @@ def filter_table_rows(data: List[Dict[str, Any]],
     Returns:
         Lista filtrada de filas
     """
-    from report_platform.core.conditions_engine import evaluate_condition
+    from report_platform.core.conditions_engine import compile_condition
     
+    compiled = compile_condition(condition)
     filtered = []
     for row in data:
-        if evaluate_condition(condition, row):
+        if compiled.evaluate(row):
             filtered.append(row)
     
     return filtered
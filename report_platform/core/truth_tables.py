@@ -0,0 +1,301 @@
+"""
+Truth Tables - Compilador de tablas de verdad de los bloques de texto
+
+Casi todas las condiciones ('cuando') de bloques_texto*.yaml dependen solo de
+variables condicionales con opciones enumeradas (radio/select), así que el
+espacio de entradas de cada bloque es finito. Este módulo enumera, bloque a
+bloque, todas las combinaciones de valores de las variables que leen sus
+reglas y guarda qué regla se selecciona en cada una.
+
+Las tablas se guardan en ``.truth_tables.json`` junto al plugin, con el hash
+de los YAML de origen. Al cargar el plugin se registran en el motor de
+condiciones (ver conditions_engine.register_truth_table) y elegir la regla
+de un bloque pasa a ser una búsqueda en un diccionario. Un contexto con
+valores fuera de la tabla se evalúa con normalidad.
+
+Uso:
+    python -m report_platform.core.truth_tables informe_auditoria
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from report_platform.core.utils import setup_logger, get_reports_dir, load_yaml
+from report_platform.core.config_loader import load_conditional_variables, load_manifest
+from report_platform.core.conditions_engine import (
+    TruthTable,
+    compile_truth_table,
+    register_truth_table,
+)
+
+logger = setup_logger(__name__)
+
+TRUTH_TABLES_FILENAME = ".truth_tables.json"
+TRUTH_TABLES_VERSION = 1
+
+# .truth_tables.json resuelto -> firma (mtime, tamaño) de la tabla y sus fuentes
+_loaded: Dict[Path, Tuple] = {}
+_loaded_lock = threading.Lock()
+
+
+# ==============================================================================
+# ARCHIVOS DE ORIGEN
+# ==============================================================================
+
+def _source_files(config_dir: Path) -> List[Path]:
+    """YAML de los que depende la tabla: variables condicionales y bloques."""
+    return [config_dir / "variables_condicionales.yaml"] + sorted(config_dir.glob("bloques_texto*.yaml"))
+
+
+def _source_digests(plugin_dir: Path, config_dir: Path) -> Dict[str, str]:
+    """Hash SHA-256 de cada archivo de origen, por ruta relativa al plugin."""
+    digests = {}
+    for filepath in _source_files(config_dir):
+        if filepath.exists():
+            name = os.path.relpath(filepath, plugin_dir)
+            digests[name] = hashlib.sha256(filepath.read_bytes()).hexdigest()
+    return digests
+
+
+def _signature(table_path: Path, config_dir: Path) -> Tuple:
+    """Firma (archivo, mtime, tamaño) de la tabla y de sus fuentes."""
+    signature = []
+    for filepath in [table_path] + _source_files(config_dir):
+        try:
+            stat = filepath.stat()
+        except OSError:
+            continue
+        signature.append((filepath.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def load_block_conditions(config_dir: Path) -> List[Tuple[str, Tuple[str, ...]]]:
+    """
+    Lee las condiciones de las reglas de cada bloque.
+
+    Usa el mismo valor por defecto ('True') que el procesador de bloques,
+    de modo que la tupla coincide con la clave de get_rule_index.
+
+    Returns:
+        Lista de (id del bloque, condiciones en orden)
+    """
+    blocks = []
+    for yaml_file in sorted(config_dir.glob("bloques_texto*.yaml")):
+        with open(yaml_file, 'r', encoding='utf-8') as f:
+            content = load_yaml(f)
+
+        if isinstance(content, dict):
+            content = content.get('bloques_texto') or []
+        for block in content or []:
+            conditions = tuple(rule.get('cuando', 'True') for rule in block.get('reglas', []))
+            blocks.append((block.get('id', '?'), conditions))
+    return blocks
+
+
+def get_variable_domains(config_dir: Path) -> Dict[str, List[str]]:
+    """Valores posibles de cada variable condicional con opciones."""
+    return {
+        variable.id: [option.valor for option in variable.opciones]
+        for variable in load_conditional_variables(config_dir)
+        if variable.opciones
+    }
+
+
+def _resolve_config_dir(plugin_dir: Path) -> Path:
+    """Directorio de configuración del plugin según su manifest."""
+    manifest = load_manifest(plugin_dir)
+    if manifest is None:
+        raise ValueError(f"No se pudo cargar el manifest de {plugin_dir}")
+    return plugin_dir / manifest.paths.config_dir
+
+
+# ==============================================================================
+# COMPILACIÓN
+# ==============================================================================
+
+def compile_plugin_truth_tables(plugin_dir: Path,
+                                config_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Compila las tablas de verdad de todos los bloques de un plugin.
+
+    Los bloques que leen variables sin opciones enumeradas (o con demasiadas
+    combinaciones) se omiten y se seguirán evaluando regla a regla.
+
+    Args:
+        plugin_dir: Directorio del plugin
+        config_dir: Directorio de configuración (por defecto, el del manifest)
+
+    Returns:
+        Diccionario serializable a JSON con las tablas y el hash de las fuentes
+    """
+    config_dir = config_dir or _resolve_config_dir(plugin_dir)
+    domains = get_variable_domains(config_dir)
+
+    blocks = []
+    seen = set()
+    for block_id, conditions in load_block_conditions(config_dir):
+        if conditions in seen:
+            continue
+        seen.add(conditions)
+
+        table = compile_truth_table(conditions, domains)
+        if table is None:
+            logger.info(f"Bloque '{block_id}': sin tabla de verdad (variables no enumeradas o demasiadas combinaciones)")
+            continue
+
+        blocks.append({
+            'id': block_id,
+            'conditions': list(table.conditions),
+            'variables': list(table.variables),
+            'rules': [[list(values), rule_idx] for values, rule_idx in table.rules.items()],
+        })
+
+    return {
+        'version': TRUTH_TABLES_VERSION,
+        'sources': _source_digests(plugin_dir, config_dir),
+        'blocks': blocks,
+    }
+
+
+def write_truth_tables(plugin_dir: Path, config_dir: Optional[Path] = None) -> Path:
+    """
+    Compila y guarda las tablas de verdad de un plugin en .truth_tables.json.
+
+    La escritura es atómica (temporal + os.replace).
+
+    Args:
+        plugin_dir: Directorio del plugin
+        config_dir: Directorio de configuración (por defecto, el del manifest)
+
+    Returns:
+        Path al archivo generado
+    """
+    data = compile_plugin_truth_tables(plugin_dir, config_dir)
+    table_path = plugin_dir / TRUTH_TABLES_FILENAME
+
+    fd, tmp_name = tempfile.mkstemp(prefix=TRUTH_TABLES_FILENAME + ".", dir=plugin_dir)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_name, table_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    logger.info(f"Tablas de verdad guardadas: {table_path} ({len(data['blocks'])} bloques)")
+    return table_path
+
+
+# ==============================================================================
+# CARGA EN TIEMPO DE EJECUCIÓN
+# ==============================================================================
+
+def table_from_dict(block: Dict[str, Any]) -> TruthTable:
+    """
+    Reconstruye la tabla de verdad de un bloque guardada en JSON.
+
+    Args:
+        block: Entrada de 'blocks' (ver compile_plugin_truth_tables)
+
+    Returns:
+        TruthTable lista para registrar
+    """
+    return TruthTable(
+        conditions=tuple(block['conditions']),
+        variables=tuple(block['variables']),
+        rules={tuple(values): rule_idx for values, rule_idx in block['rules']},
+    )
+
+
+def load_truth_tables(plugin_dir: Path, config_dir: Optional[Path] = None) -> int:
+    """
+    Registra en el motor de condiciones las tablas de verdad de un plugin.
+
+    La tabla se descarta si no existe, si cambia la versión de formato o si
+    el hash de algún YAML de origen no coincide (hay que volver a compilarla).
+    Solo se vuelve a leer cuando cambia la tabla o alguno de sus YAML.
+
+    Args:
+        plugin_dir: Directorio del plugin
+        config_dir: Directorio de configuración (por defecto, el del manifest)
+
+    Returns:
+        Número de tablas registradas en esta llamada
+    """
+    table_path = plugin_dir / TRUTH_TABLES_FILENAME
+    if not table_path.exists():
+        return 0
+
+    config_dir = config_dir or _resolve_config_dir(plugin_dir)
+    key = table_path.resolve()
+    signature = _signature(table_path, config_dir)
+
+    with _loaded_lock:
+        if _loaded.get(key) == signature:
+            return 0
+
+        try:
+            with open(table_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"No se pudieron leer las tablas de verdad {table_path}: {e}")
+            return 0
+
+        if data.get('version') != TRUTH_TABLES_VERSION:
+            logger.info(f"Tablas de verdad obsoletas (versión): {table_path}")
+            return 0
+
+        if data.get('sources') != _source_digests(plugin_dir, config_dir):
+            logger.info(f"Tablas de verdad obsoletas (YAML modificados), recompilar: {table_path}")
+            _loaded[key] = signature
+            return 0
+
+        for block in data.get('blocks', []):
+            register_truth_table(table_from_dict(block))
+
+        _loaded[key] = signature
+
+    logger.info(f"Tablas de verdad cargadas: {table_path} ({len(data['blocks'])} bloques)")
+    return len(data['blocks'])
+
+
+# ==============================================================================
+# LÍNEA DE COMANDOS
+# ==============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de ``python -m report_platform.core.truth_tables``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m report_platform.core.truth_tables",
+        description="Precompila las tablas de verdad de los bloques de texto de un plugin.",
+    )
+    parser.add_argument("plugin", help="ID (directorio) del plugin o ruta a su directorio")
+    args = parser.parse_args(argv)
+
+    plugin_dir = Path(args.plugin)
+    if not plugin_dir.is_dir():
+        plugin_dir = get_reports_dir() / args.plugin
+    if not (plugin_dir / "manifest.yaml").exists():
+        print(f"Plugin no encontrado: {args.plugin}")
+        return 1
+
+    table_path = write_truth_tables(plugin_dir)
+    with open(table_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    for block in data['blocks']:
+        print(f"✅ {block['id']}: {len(block['rules'])} combinaciones "
+              f"({', '.join(block['variables'])})")
+    print(f"\nTablas guardadas en {table_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
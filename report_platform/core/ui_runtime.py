@@ -5,9 +5,8 @@ Genera automáticamente controles de interfaz Streamlit basándose en
 definiciones de campos YAML, permitiendo formularios completamente dinámicos.
 """
 
-import streamlit as st
 from typing import Dict, Any, List, Optional
-from report_platform.core.utils import setup_logger
+from report_platform.core.utils import setup_logger, lazy_import
 from report_platform.core.schema_models import SimpleField, ConditionalVariable
 from report_platform.core.conditions_engine import evaluate_condition
 from report_platform.core.input_widgets import (
@@ -19,6 +18,9 @@ from report_platform.core.input_widgets import (
     render_text_input,
 )
 
+# Streamlit se carga en el primer uso de un widget
+st = lazy_import("streamlit")
+
 logger = setup_logger(__name__)
 
 
@@ -67,20 +69,20 @@ def identify_date_groups(fields: List[SimpleField]) -> Dict[str, Dict[str, Simpl
     return valid_groups
 
 
-def get_date_group_label(fields_group: Dict[str, SimpleField], config_dir) -> str:
+def get_date_group_label(fields_group: Dict[str, SimpleField], config_dir=None,
+                         date_group_labels: Optional[Dict[str, str]] = None) -> str:
     """
     Obtiene la etiqueta para un grupo de fechas desde la configuración.
 
     Args:
         fields_group: Grupo de campos de fecha
-        config_dir: Directorio de configuración
+        config_dir: Directorio de configuración (si no se pasan las etiquetas)
+        date_group_labels: Etiquetas ya resueltas {grupo: etiqueta}
+            (plugin_config['date_group_labels']); evita consultar la configuración
 
     Returns:
         Etiqueta del grupo o etiqueta por defecto
     """
-    # Intentar obtener la etiqueta desde la configuración
-    from report_platform.core.config_loader import get_general_config
-
     # Buscar el nombre del grupo en alguno de los campos
     group_name = None
     for field in fields_group.values():
@@ -89,12 +91,12 @@ def get_date_group_label(fields_group: Dict[str, SimpleField], config_dir) -> st
             break
 
     if group_name:
-        general_config = get_general_config(config_dir)
-        agrupaciones = general_config.get('agrupaciones_fecha', [])
+        if date_group_labels is None and config_dir:
+            from report_platform.core.config_loader import get_date_group_labels
+            date_group_labels = get_date_group_labels(config_dir)
 
-        for agrupacion in agrupaciones:
-            if agrupacion.get('grupo') == group_name:
-                return agrupacion.get('etiqueta', group_name)
+        if date_group_labels and group_name in date_group_labels:
+            return date_group_labels[group_name]
 
     # Etiqueta por defecto
     return "Fecha"
@@ -237,6 +239,7 @@ def render_section_fields(
     fields: List[SimpleField],
     context: Dict[str, Any],
     config_dir=None,
+    date_group_labels: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
     """
     Renderiza todos los campos de una sección.
@@ -246,6 +249,7 @@ def render_section_fields(
         fields: Lista de campos de la sección
         context: Contexto actual
         config_dir: Directorio de configuración (para obtener etiquetas de grupos)
+        date_group_labels: Etiquetas de grupos de fecha ya resueltas (opcional)
 
     Returns:
         Diccionario con valores recolectados {field_id: value}
@@ -273,8 +277,8 @@ def render_section_fields(
 
         if should_show:
             # Obtener etiqueta del grupo
-            if config_dir:
-                group_label = get_date_group_label(fields_group, config_dir)
+            if date_group_labels is not None or config_dir:
+                group_label = get_date_group_label(fields_group, config_dir, date_group_labels)
             else:
                 group_label = "Fecha"
 
@@ -320,6 +324,7 @@ def render_all_fields(
     sections_order: Optional[List[str]] = None,
     initial_context: Optional[Dict[str, Any]] = None,
     config_dir=None,
+    date_group_labels: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
     """
     Renderiza todos los campos organizados por secciones.
@@ -329,6 +334,7 @@ def render_all_fields(
         sections_order: Orden de las secciones (opcional)
         initial_context: Contexto inicial con valores
         config_dir: Directorio de configuración
+        date_group_labels: Etiquetas de grupos de fecha ya resueltas (opcional)
 
     Returns:
         Diccionario con todos los valores recolectados
@@ -354,6 +360,7 @@ def render_all_fields(
             fields_by_section[section],
             context,
             config_dir,
+            date_group_labels,
         )
         all_values.update(section_values)
         context.update(section_values)
@@ -447,17 +454,22 @@ def show_info_message(message: str) -> None:
     st.info(message)
 
 
-def create_download_button(file_path, button_label: str = "Descargar informe") -> None:
+def create_download_button(file_path, button_label: str = "Descargar informe",
+                           data: Optional[bytes] = None) -> None:
     """
     Crea un botón de descarga para un archivo.
     
     Args:
-        file_path: Path al archivo
+        file_path: Path al archivo (se usa su nombre para la descarga)
         button_label: Texto del botón
+        data: Contenido ya generado en memoria; si se indica, no se lee el archivo
     """
     try:
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
+        if data is not None:
+            file_data = data
+        else:
+            with open(file_path, 'rb') as f:
+                file_data = f.read()
         
         st.download_button(
             label=button_label,
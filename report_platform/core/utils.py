@@ -4,11 +4,15 @@ Utils - Utilidades generales de la plataforma
 Funciones auxiliares para logging, manejo de paths y otras operaciones comunes.
 """
 
+import importlib.util
 import logging
 from pathlib import Path
-from typing import Optional
+from types import ModuleType
+from typing import Any, Optional, Union, IO
 import sys
 
+import yaml
+
 
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
@@ -100,6 +104,59 @@ def safe_filename(filename: str) -> str:
     return filename.strip()
 
 
+def lazy_import(module_name: str) -> ModuleType:
+    """
+    Importa un módulo de forma diferida (importlib.util.LazyLoader).
+
+    El módulo se registra en sys.modules pero no se ejecuta hasta que se
+    accede a alguno de sus atributos, de modo que las dependencias pesadas
+    (p. ej. streamlit) solo se cargan si realmente se usan.
+
+    Args:
+        module_name: Nombre completo del módulo
+
+    Returns:
+        Módulo (cargado o pendiente de cargar)
+
+    Raises:
+        ModuleNotFoundError: Si el módulo no está instalado
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{module_name}'", name=module_name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Loader seguro de YAML: la versión en C (libyaml) si está disponible
+YAML_SAFE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def load_yaml(stream: Union[str, bytes, IO], loader: Optional[type] = None) -> Any:
+    """
+    Parsea YAML de forma segura (equivalente a yaml.safe_load).
+
+    Usa yaml.CSafeLoader cuando PyYAML está compilado con libyaml (varias
+    veces más rápido) y yaml.SafeLoader en caso contrario.
+
+    Args:
+        stream: Texto, bytes o archivo abierto con el YAML
+        loader: Clase de loader a usar (por defecto YAML_SAFE_LOADER)
+
+    Returns:
+        Objeto Python resultante
+    """
+    return yaml.load(stream, Loader=loader or YAML_SAFE_LOADER)
+
+
 def load_text_file(filepath: Path, encoding: str = 'utf-8') -> Optional[str]:
     """
     Carga un archivo de texto de forma segura.
@@ -6,11 +6,18 @@ Implementación placeholder que puede extenderse para soportar
 renderizado completo de Word con formato preservado.
 """
 
+import copy
+import io
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
-from jinja2 import Environment, FileSystemLoader, BaseLoader
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
 from report_platform.core.utils import setup_logger, get_outputs_dir, safe_filename
 
+# Jinja2 y docxtpl se importan en el primer uso para no penalizar el arranque
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
 logger = setup_logger(__name__)
 
 
@@ -18,6 +25,27 @@ logger = setup_logger(__name__)
 # RENDERIZADO BÁSICO DE PLANTILLAS
 # ==============================================================================
 
+@lru_cache(maxsize=None)
+def _get_string_env() -> "Environment":
+    """Entorno compartido para plantillas en forma de string (creado en el primer uso)."""
+    from jinja2 import Environment, BaseLoader
+    return Environment(loader=BaseLoader())
+
+
+@lru_cache(maxsize=1024)
+def compile_template_string(template_content: str) -> "Template":
+    """
+    Compila una plantilla string, reutilizando la versión cacheada si existe.
+    
+    Args:
+        template_content: Contenido de la plantilla
+    
+    Returns:
+        Template de Jinja2 compilado
+    """
+    return _get_string_env().from_string(template_content)
+
+
 def render_template_string(template_content: str, context: Dict[str, Any]) -> str:
     """
     Renderiza una plantilla como string con Jinja2.
@@ -30,33 +58,192 @@ def render_template_string(template_content: str, context: Dict[str, Any]) -> st
         Texto renderizado
     """
     try:
-        env = Environment(loader=BaseLoader())
-        template = env.from_string(template_content)
+        template = compile_template_string(template_content)
         return template.render(**context)
     except Exception as e:
         logger.error(f"Error renderizando plantilla: {e}")
         return ""
 
 
+# ==============================================================================
+# CACHÉ DE PLANTILLAS WORD PREPROCESADAS
+# ==============================================================================
+
+@lru_cache(maxsize=None)
+def _caching_environment_class():
+    """Crea (una sola vez) el entorno Jinja2 con caché de plantillas compiladas."""
+    from jinja2 import Environment
+
+    class _CachingEnvironment(Environment):
+        """Entorno Jinja2 que reutiliza las plantillas ya compiladas por su código fuente."""
+
+        max_cached_templates = 64
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._compiled: Dict[str, "Template"] = {}
+
+        def from_string(self, source, globals=None, template_class=None):
+            if globals is not None or template_class is not None or not isinstance(source, str):
+                return super().from_string(source, globals, template_class)
+
+            template = self._compiled.get(source)
+            if template is None:
+                template = super().from_string(source)
+                if len(self._compiled) >= self.max_cached_templates:
+                    self._compiled.clear()
+                self._compiled[source] = template
+            return template
+
+    return _CachingEnvironment
+
+
+class _DocxTemplateCacheEntry:
+    """
+    Datos compartidos de una plantilla Word cacheada.
+
+    Contiene el .docx en memoria, el documento ya descomprimido y parseado
+    (python-docx), el XML ya limpiado por docxtpl (patch_xml) y un entorno
+    Jinja2 con las plantillas del cuerpo, cabeceras y pies ya compiladas.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.patched_xml: Dict[str, str] = {}
+        self.jinja_env = _caching_environment_class()()
+        self._document = None
+        self._document_lock = threading.Lock()
+
+    def new_document(self):
+        """
+        Devuelve una copia del documento parseado para un renderizado.
+
+        El .docx se descomprime y se parsea una sola vez; cada renderizado
+        trabaja sobre una copia profunda (docxtpl modifica el documento).
+        """
+        from docx import Document
+
+        with self._document_lock:
+            if self._document is None:
+                self._document = Document(io.BytesIO(self.data))
+            return copy.deepcopy(self._document)
+
+
+# template_path -> ((mtime_ns, tamaño), entrada de caché)
+_docx_template_cache: Dict[Path, Tuple[Tuple[int, int], _DocxTemplateCacheEntry]] = {}
+_docx_template_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _cached_docx_template_class():
+    """
+    Crea (una sola vez) la subclase de DocxTemplate que usa la caché.
+
+    Se define de forma perezosa para que docxtpl siga siendo una dependencia
+    que solo se importa al renderizar.
+    """
+    from docxtpl import DocxTemplate
+
+    class CachedDocxTemplate(DocxTemplate):
+        """DocxTemplate que reutiliza el documento parseado, el XML preprocesado y el Jinja2 compilado."""
+
+        def __init__(self, entry: _DocxTemplateCacheEntry):
+            super().__init__(io.BytesIO(entry.data))
+            self._cache_entry = entry
+
+        def init_docx(self, reload: bool = True):
+            if not self.docx or (self.is_rendered and reload):
+                self.docx = self._cache_entry.new_document()
+                self.is_rendered = False
+
+        def patch_xml(self, src_xml):
+            patched = self._cache_entry.patched_xml.get(src_xml)
+            if patched is None:
+                patched = super().patch_xml(src_xml)
+                self._cache_entry.patched_xml[src_xml] = patched
+            return patched
+
+        def render(self, context, jinja_env=None, autoescape=False):
+            if jinja_env is None and not autoescape:
+                jinja_env = self._cache_entry.jinja_env
+            return super().render(context, jinja_env, autoescape)
+
+    return CachedDocxTemplate
+
+
+def get_docx_template(template_path: Path):
+    """
+    Devuelve un DocxTemplate listo para renderizar, usando la caché de plantillas.
+
+    La primera vez se lee y se parsea el .docx; las siguientes solo se hace
+    una copia profunda del documento ya parseado. La limpieza del XML y la
+    compilación Jinja2 de docxtpl se hacen una única vez por plantilla. La caché se invalida si cambian la fecha
+    de modificación o el tamaño del archivo.
+
+    Args:
+        template_path: Path a la plantilla Word (.docx)
+
+    Returns:
+        Instancia nueva de DocxTemplate (una por renderizado)
+    """
+    template_class = _cached_docx_template_class()
+
+    key = Path(template_path).resolve()
+    stat = key.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _docx_template_lock:
+        cached = _docx_template_cache.get(key)
+        if cached is None or cached[0] != signature:
+            entry = _DocxTemplateCacheEntry(key.read_bytes())
+            _docx_template_cache[key] = (signature, entry)
+            logger.info(f"Plantilla Word cargada en caché: {key.name}")
+        else:
+            entry = cached[1]
+
+    return template_class(entry)
+
+
+def warm_docx_template(template_path: Path) -> None:
+    """
+    Precarga una plantilla en la caché y compila sus partes.
+
+    Hace un renderizado de prueba con contexto vacío (sin guardar) para que
+    el primer informe real ya encuentre el XML preprocesado y compilado.
+
+    Args:
+        template_path: Path a la plantilla Word (.docx)
+    """
+    try:
+        get_docx_template(template_path).render({})
+    except Exception as e:
+        logger.warning(f"No se pudo precargar la plantilla {template_path}: {e}")
+
+
+def clear_docx_template_cache() -> None:
+    """Vacía la caché de plantillas Word."""
+    with _docx_template_lock:
+        _docx_template_cache.clear()
+
+
 # ==============================================================================
 # RENDERIZADO DE DOCUMENTOS WORD (PLACEHOLDER)
 # ==============================================================================
 
-def render_word_report(template_path: Path, context: Dict[str, Any],
-                      output_filename: str) -> Optional[Path]:
+def render_word_report_bytes(template_path: Path,
+                             context: Dict[str, Any]) -> Optional[bytes]:
     """
-    Renderiza un informe Word desde una plantilla.
+    Renderiza un informe Word en memoria, sin escribir en disco.
 
-    Utiliza docxtpl para renderizar plantillas Word con variables Jinja2,
-    preservando el formato del documento original.
+    Útil para enviar el documento directamente al cliente (descarga en la UI,
+    respuesta HTTP) sin pasar por el directorio de salida.
 
     Args:
         template_path: Path a la plantilla Word (.docx)
         context: Diccionario con todas las variables
-        output_filename: Nombre del archivo de salida
 
     Returns:
-        Path al archivo generado o None si hay error
+        Contenido del .docx generado o None si hay error
     """
     logger.info(f"Renderizando informe desde: {template_path}")
 
@@ -66,33 +253,20 @@ def render_word_report(template_path: Path, context: Dict[str, Any],
             logger.error(f"Plantilla no encontrada: {template_path}")
             return None
 
-        # Obtener directorio de salida
-        output_dir = get_outputs_dir()
-
-        # Nombre seguro del archivo
-        safe_name = safe_filename(output_filename)
-        if not safe_name.endswith('.docx'):
-            safe_name += '.docx'
-
-        output_path = output_dir / safe_name
-
         # Renderizar con docxtpl
         try:
-            from docxtpl import DocxTemplate
-
-            # Cargar plantilla
-            doc = DocxTemplate(str(template_path))
+            # Obtener plantilla desde la caché (preprocesada y compilada)
+            doc = get_docx_template(template_path)
 
             # Renderizar con contexto
             # Filtrar valores None para evitar errores en el template
             clean_context = {k: (v if v is not None else '') for k, v in context.items()}
             doc.render(clean_context)
 
-            # Guardar documento
-            doc.save(str(output_path))
-
-            logger.info(f"✅ Informe Word generado exitosamente: {output_path}")
-            return output_path
+            # Guardar documento en memoria
+            buffer = io.BytesIO()
+            doc.save(buffer)
+            return buffer.getvalue()
 
         except ImportError:
             logger.error("docxtpl no está instalado. Instalarlo con: pip install docxtpl")
@@ -105,6 +279,66 @@ def render_word_report(template_path: Path, context: Dict[str, Any],
         return None
 
 
+def save_report_bytes(data: bytes, output_filename: str,
+                      output_dir: Optional[Path] = None) -> Path:
+    """
+    Guarda en disco un informe renderizado en memoria.
+
+    Args:
+        data: Contenido del .docx
+        output_filename: Nombre del archivo de salida
+        output_dir: Directorio de salida (por defecto get_outputs_dir())
+
+    Returns:
+        Path al archivo guardado
+    """
+    # Obtener directorio de salida
+    if output_dir is None:
+        output_dir = get_outputs_dir()
+    else:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Nombre seguro del archivo
+    safe_name = safe_filename(output_filename)
+    if not safe_name.endswith('.docx'):
+        safe_name += '.docx'
+
+    output_path = output_dir / safe_name
+    output_path.write_bytes(data)
+
+    logger.info(f"✅ Informe Word generado exitosamente: {output_path}")
+    return output_path
+
+
+def render_word_report(template_path: Path, context: Dict[str, Any],
+                      output_filename: str,
+                      output_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Renderiza un informe Word desde una plantilla y lo guarda en disco.
+
+    Utiliza docxtpl para renderizar plantillas Word con variables Jinja2,
+    preservando el formato del documento original.
+
+    Args:
+        template_path: Path a la plantilla Word (.docx)
+        context: Diccionario con todas las variables
+        output_filename: Nombre del archivo de salida
+        output_dir: Directorio de salida (por defecto get_outputs_dir())
+
+    Returns:
+        Path al archivo generado o None si hay error
+    """
+    data = render_word_report_bytes(template_path, context)
+    if data is None:
+        return None
+
+    try:
+        return save_report_bytes(data, output_filename, output_dir)
+    except Exception as e:
+        logger.error(f"Error guardando informe: {e}")
+        return None
+
+
 # ==============================================================================
 # RENDERIZADO AVANZADO (FUTURO)
 # ==============================================================================
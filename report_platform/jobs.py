@@ -0,0 +1,620 @@
+"""
+Jobs - Cola persistente de trabajos por lotes (reanudable)
+
+Guarda en una base de datos SQLite local cada ejecución por lotes y el estado
+de cada uno de sus registros (pending, running, done, failed), junto con la
+ruta del documento generado, el error y el ID de metadata. Si la ejecución
+se interrumpe (Ctrl+C, caída del proceso, reinicio de la máquina), puede
+reanudarse sin volver a generar los documentos ya terminados.
+
+Los registros de entrada se copian a la base de datos al crear la
+ejecución, de modo que reanudarla no depende del archivo original. Los
+nombres de archivo usan el ID de la ejecución y la posición del registro,
+así que un registro regenerado sobrescribe su propio documento.
+
+La base de datos está en ``<directorio de metadatos>/jobs.db`` (ver
+REPORT_METADATA_DIR en core/metadata.py). Solo el proceso principal escribe
+en ella; los procesos del pool solo generan documentos.
+
+Cada ejecución la trabaja un único proceso: al empezar la reclama (equipo,
+PID y latido) y otro proceso no puede ejecutarla ni reanudarla mientras el
+propietario siga vivo y su latido sea reciente.
+
+Uso:
+    python -m report_platform.jobs ejecutar informe_auditoria registros.jsonl --procesos 4
+    python -m report_platform.jobs reanudar 20240101_120000_3f9a2c
+    python -m report_platform.jobs reanudar 20240101_120000_3f9a2c --reintentar-fallidos
+    python -m report_platform.jobs estado [run_id]
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from pydantic import BaseModel, Field
+
+from report_platform.core.utils import setup_logger
+from report_platform.core.metadata import get_metadata_dir
+from report_platform.batch import BatchRecordResult, iter_generate, load_records, new_run_id
+
+logger = setup_logger(__name__)
+
+JOBS_DB_FILENAME = "jobs.db"
+
+# Estados de un trabajo (un registro de la ejecución)
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+JOB_STATUSES = (STATUS_PENDING, STATUS_RUNNING, STATUS_DONE, STATUS_FAILED)
+
+# Segundos sin latido tras los que se considera abandonada una ejecución
+RUN_LEASE_SECONDS = 300
+
+
+class RunLockedError(RuntimeError):
+    """La ejecución la está trabajando otro proceso."""
+
+
+# ==============================================================================
+# MODELOS
+# ==============================================================================
+
+class JobRun(BaseModel):
+    """Ejecución por lotes registrada en la cola."""
+    id: str = Field(description="ID de la ejecución (también prefijo de los archivos)")
+    report_id: str = Field(description="ID del plugin de informe")
+    input_path: Optional[str] = Field(None, description="Archivo de entrada original")
+    output_dir: Optional[str] = Field(None, description="Directorio de salida")
+    save_meta: bool = Field(False, description="Si se guardan metadatos de cada informe")
+    created_at: str = Field(description="Fecha de creación (ISO)")
+    owner: Optional[str] = Field(None, description="Proceso que la trabaja (equipo:PID)")
+    heartbeat: Optional[float] = Field(None, description="Último latido del propietario (epoch)")
+    counts: Dict[str, int] = Field(default_factory=dict, description="Trabajos por estado")
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def finished(self) -> bool:
+        """True si no quedan trabajos pendientes ni en curso."""
+        return not self.counts.get(STATUS_PENDING) and not self.counts.get(STATUS_RUNNING)
+
+    @property
+    def active(self) -> bool:
+        """True si otro proceso vivo está trabajando la ejecución."""
+        return _owner_alive(self.owner, self.heartbeat)
+
+
+class Job(BaseModel):
+    """Estado de un registro de una ejecución."""
+    run_id: str
+    index: int = Field(description="Posición del registro en el archivo de entrada")
+    status: str = Field(description="pending, running, done o failed")
+    record: Dict[str, Any] = Field(description="Datos de entrada del registro")
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    metadata_id: Optional[str] = None
+    attempts: int = 0
+    updated_at: Optional[str] = None
+
+
+# ==============================================================================
+# PROPIETARIO DE UNA EJECUCIÓN
+# ==============================================================================
+
+def _current_owner() -> str:
+    """Identificador de este proceso: equipo:PID."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid: int) -> bool:
+    """True si existe un proceso con ese PID en este equipo."""
+    if os.name == 'nt':
+        # os.kill(pid, 0) termina el proceso en Windows; solo cuenta el latido
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_alive(owner: Optional[str], heartbeat: Optional[float]) -> bool:
+    """
+    Indica si el propietario de una ejecución sigue trabajándola.
+
+    Un latido más antiguo que RUN_LEASE_SECONDS libera la ejecución. En el
+    mismo equipo, además, se libera en cuanto el proceso deja de existir.
+    """
+    if not owner or heartbeat is None or time.time() - heartbeat > RUN_LEASE_SECONDS:
+        return False
+    host, _, pid = owner.rpartition(':')
+    if host == socket.gethostname() and pid.isdigit():
+        return _pid_alive(int(pid))
+    return True
+
+
+# ==============================================================================
+# COLA PERSISTENTE
+# ==============================================================================
+
+def get_jobs_db() -> Path:
+    """
+    Obtiene la ruta de la base de datos de trabajos.
+
+    Returns:
+        Path a jobs.db en el directorio de metadatos
+    """
+    return get_metadata_dir() / JOBS_DB_FILENAME
+
+
+class JobQueue:
+    """
+    Cola de trabajos por lotes guardada en SQLite.
+
+    Cada método abre su propia conexión y confirma la transacción al
+    terminar, de modo que el estado en disco siempre refleja el último
+    cambio aunque el proceso muera a continuación.
+    """
+
+    BUSY_TIMEOUT = 30.0
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id TEXT PRIMARY KEY,
+            report_id TEXT NOT NULL,
+            input_path TEXT,
+            output_dir TEXT,
+            save_meta INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            owner TEXT,
+            heartbeat REAL
+        );
+        CREATE TABLE IF NOT EXISTS jobs (
+            run_id TEXT NOT NULL REFERENCES runs (id),
+            idx INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            record TEXT NOT NULL,
+            output_path TEXT,
+            error TEXT,
+            metadata_id TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT,
+            PRIMARY KEY (run_id, idx)
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_run_status ON jobs (run_id, status);
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Abre (o crea) la base de datos de trabajos.
+
+        Args:
+            db_path: Path al archivo .db (por defecto get_jobs_db())
+        """
+        self.db_path = db_path or get_jobs_db()
+        self.owner = _current_owner()
+        with self._connect() as conn:
+            conn.executescript(self._SCHEMA)
+            # Bases de datos creadas antes de que existiera el propietario
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+            if 'owner' not in columns:
+                conn.execute("ALTER TABLE runs ADD COLUMN owner TEXT")
+            if 'heartbeat' not in columns:
+                conn.execute("ALTER TABLE runs ADD COLUMN heartbeat REAL")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Conexión que confirma la transacción al salir y siempre se cierra."""
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --------------------------------------------------------------------------
+    # Ejecuciones
+    # --------------------------------------------------------------------------
+
+    def create_run(self, report_id: str, records: List[Dict[str, Any]],
+                   input_path: Optional[Path] = None,
+                   output_dir: Optional[Path] = None,
+                   save_meta: bool = False) -> str:
+        """
+        Registra una ejecución nueva con todos sus registros pendientes.
+
+        Args:
+            report_id: ID del plugin de informe
+            records: Registros de entrada
+            input_path: Archivo de entrada original (solo informativo)
+            output_dir: Directorio de salida (None = get_outputs_dir())
+            save_meta: Si se guardan metadatos de cada informe
+
+        Returns:
+            ID de la ejecución
+        """
+        now = datetime.now().isoformat()
+
+        with self._connect() as conn:
+            # new_run_id ya es único en la práctica; se comprueba igualmente
+            run_id = new_run_id()
+            while conn.execute("SELECT 1 FROM runs WHERE id = ?", (run_id,)).fetchone():
+                run_id = new_run_id()
+
+            conn.execute(
+                "INSERT INTO runs (id, report_id, input_path, output_dir, save_meta, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, report_id,
+                 str(input_path) if input_path else None,
+                 str(Path(output_dir).resolve()) if output_dir else None,
+                 int(save_meta), now),
+            )
+            conn.executemany(
+                "INSERT INTO jobs (run_id, idx, status, record, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    # Los valores no JSON (p. ej. fechas de YAML) se guardan como texto
+                    (run_id, idx, STATUS_PENDING,
+                     json.dumps(record, ensure_ascii=False, default=str), now)
+                    for idx, record in enumerate(records)
+                ],
+            )
+
+        logger.info(f"Ejecución creada: {run_id} ({len(records)} registros)")
+        return run_id
+
+    def _count_by_status(self, conn: sqlite3.Connection, run_id: str) -> Dict[str, int]:
+        rows = conn.execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status", (run_id,)
+        ).fetchall()
+        return {status: count for status, count in rows}
+
+    def get_run(self, run_id: str) -> Optional[JobRun]:
+        """
+        Obtiene una ejecución con el recuento de trabajos por estado.
+
+        Args:
+            run_id: ID de la ejecución
+
+        Returns:
+            JobRun o None si no existe
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, report_id, input_path, output_dir, save_meta, created_at, "
+                "owner, heartbeat FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            counts = self._count_by_status(conn, run_id)
+
+        return JobRun(id=row[0], report_id=row[1], input_path=row[2], output_dir=row[3],
+                      save_meta=bool(row[4]), created_at=row[5], owner=row[6],
+                      heartbeat=row[7], counts=counts)
+
+    def list_runs(self, limit: int = 20) -> List[JobRun]:
+        """
+        Lista las ejecuciones más recientes.
+
+        Args:
+            limit: Número máximo de ejecuciones
+
+        Returns:
+            Lista de JobRun, de la más reciente a la más antigua
+        """
+        with self._connect() as conn:
+            run_ids = [row[0] for row in conn.execute(
+                "SELECT id FROM runs ORDER BY created_at DESC, id DESC LIMIT ?", (limit,)
+            )]
+        return [run for run in (self.get_run(run_id) for run_id in run_ids) if run]
+
+    def claim_run(self, run_id: str) -> None:
+        """
+        Reclama una ejecución para este proceso.
+
+        La comprobación y la escritura se hacen en una transacción
+        BEGIN IMMEDIATE, así que dos procesos no pueden reclamarla a la vez.
+
+        Args:
+            run_id: ID de la ejecución
+
+        Raises:
+            ValueError: Si la ejecución no existe
+            RunLockedError: Si otro proceso vivo la está trabajando
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT owner, heartbeat FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Ejecución no encontrada: {run_id}")
+
+            owner, heartbeat = row
+            if owner != self.owner and _owner_alive(owner, heartbeat):
+                raise RunLockedError(f"La ejecución {run_id} la está trabajando {owner}")
+
+            conn.execute(
+                "UPDATE runs SET owner = ?, heartbeat = ? WHERE id = ?",
+                (self.owner, time.time(), run_id),
+            )
+
+    def release_run(self, run_id: str) -> None:
+        """Libera una ejecución reclamada por este proceso."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE runs SET owner = NULL, heartbeat = NULL WHERE id = ? AND owner = ?",
+                (run_id, self.owner),
+            )
+
+    def _touch(self, conn: sqlite3.Connection, run_id: str) -> None:
+        """Renueva el latido de una ejecución reclamada por este proceso."""
+        conn.execute(
+            "UPDATE runs SET heartbeat = ? WHERE id = ? AND owner = ?",
+            (time.time(), run_id, self.owner),
+        )
+
+    # --------------------------------------------------------------------------
+    # Trabajos
+    # --------------------------------------------------------------------------
+
+    def get_jobs(self, run_id: str, status: Optional[str] = None) -> List[Job]:
+        """
+        Obtiene los trabajos de una ejecución, en el orden de entrada.
+
+        Args:
+            run_id: ID de la ejecución
+            status: Filtrar por estado (opcional)
+
+        Returns:
+            Lista de Job
+        """
+        query = ("SELECT run_id, idx, status, record, output_path, error, metadata_id, "
+                 "attempts, updated_at FROM jobs WHERE run_id = ?")
+        params: Tuple = (run_id,)
+        if status is not None:
+            query += " AND status = ?"
+            params += (status,)
+        query += " ORDER BY idx"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            Job(run_id=row[0], index=row[1], status=row[2], record=json.loads(row[3]),
+                output_path=row[4], error=row[5], metadata_id=row[6],
+                attempts=row[7], updated_at=row[8])
+            for row in rows
+        ]
+
+    def recover(self, run_id: str, retry_failed: bool = False) -> int:
+        """
+        Prepara una ejecución interrumpida para reanudarla.
+
+        Debe llamarse con la ejecución reclamada (ver claim_run): así ningún
+        otro proceso vivo tiene trabajos 'running' en ella.
+
+        - Los trabajos 'running' (el proceso murió a medias) vuelven a 'pending'.
+        - Los trabajos 'done' cuyo documento ya no existe vuelven a 'pending'.
+        - Con retry_failed, los trabajos 'failed' también vuelven a 'pending'.
+
+        Args:
+            run_id: ID de la ejecución
+            retry_failed: Si deben reintentarse los trabajos fallidos
+
+        Returns:
+            Número de trabajos devueltos a 'pending'
+        """
+        now = datetime.now().isoformat()
+        reset_statuses = [STATUS_RUNNING] + ([STATUS_FAILED] if retry_failed else [])
+
+        with self._connect() as conn:
+            placeholders = ", ".join("?" * len(reset_statuses))
+            reset = conn.execute(
+                f"UPDATE jobs SET status = ?, updated_at = ? "
+                f"WHERE run_id = ? AND status IN ({placeholders})",
+                (STATUS_PENDING, now, run_id, *reset_statuses),
+            ).rowcount
+
+            missing = [
+                (STATUS_PENDING, now, run_id, idx)
+                for idx, output_path in conn.execute(
+                    "SELECT idx, output_path FROM jobs WHERE run_id = ? AND status = ?",
+                    (run_id, STATUS_DONE),
+                )
+                if not output_path or not Path(output_path).exists()
+            ]
+            if missing:
+                conn.executemany(
+                    "UPDATE jobs SET status = ?, output_path = NULL, updated_at = ? "
+                    "WHERE run_id = ? AND idx = ?",
+                    missing,
+                )
+
+        if reset or missing:
+            logger.info(f"{run_id}: {reset + len(missing)} trabajos vuelven a 'pending'")
+        return reset + len(missing)
+
+    def mark_running(self, run_id: str, indices: List[int]) -> None:
+        """Marca trabajos como en curso e incrementa su número de intentos."""
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE run_id = ? AND idx = ?",
+                [(STATUS_RUNNING, now, run_id, idx) for idx in indices],
+            )
+            self._touch(conn, run_id)
+
+    def record_result(self, run_id: str, result: BatchRecordResult) -> None:
+        """
+        Guarda el resultado de un registro ('done' o 'failed').
+
+        Args:
+            run_id: ID de la ejecución
+            result: Resultado devuelto por el generador por lotes
+        """
+        status = STATUS_DONE if result.status == 'ok' else STATUS_FAILED
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, output_path = ?, error = ?, metadata_id = ?, "
+                "updated_at = ? WHERE run_id = ? AND idx = ?",
+                (status, result.output_path, result.error, result.metadata_id,
+                 datetime.now().isoformat(), run_id, result.index),
+            )
+            self._touch(conn, run_id)
+
+
+# ==============================================================================
+# EJECUCIÓN
+# ==============================================================================
+
+def run_jobs(queue: JobQueue, run_id: str, workers: int = 1,
+             retry_failed: bool = False) -> JobRun:
+    """
+    Genera los trabajos pendientes de una ejecución (nueva o interrumpida).
+
+    Los trabajos terminados no se vuelven a generar. Cada trabajo se marca
+    'running' cuando empieza a generarse (o se envía al pool) y su resultado
+    se guarda en cuanto está listo, así que una interrupción solo pierde los
+    documentos que estaban en curso. La ejecución queda reclamada por este
+    proceso hasta que termina.
+
+    Args:
+        queue: Cola de trabajos
+        run_id: ID de la ejecución
+        workers: Número de procesos (1 = secuencial, 0 = uno por CPU)
+        retry_failed: Si deben reintentarse los trabajos fallidos
+
+    Returns:
+        JobRun con el recuento final por estado
+
+    Raises:
+        ValueError: Si la ejecución no existe
+        RunLockedError: Si otro proceso vivo la está trabajando
+    """
+    queue.claim_run(run_id)
+    try:
+        run = queue.get_run(run_id)
+        queue.recover(run_id, retry_failed=retry_failed)
+        pending = queue.get_jobs(run_id, status=STATUS_PENDING)
+
+        if pending:
+            logger.info(f"{run_id}: {len(pending)} de {run.total} trabajos pendientes")
+
+            results = iter_generate(
+                run.report_id,
+                [(job.index, job.record) for job in pending],
+                output_dir=Path(run.output_dir) if run.output_dir else None,
+                save_meta=run.save_meta,
+                workers=workers,
+                run_id=run_id,
+                on_start=lambda idx: queue.mark_running(run_id, [idx]),
+            )
+            for result in results:
+                queue.record_result(run_id, result)
+        else:
+            logger.info(f"{run_id}: no hay trabajos pendientes")
+    finally:
+        queue.release_run(run_id)
+
+    return queue.get_run(run_id)
+
+
+# ==============================================================================
+# LÍNEA DE COMANDOS
+# ==============================================================================
+
+def _print_run(run: JobRun) -> None:
+    counts = " | ".join(f"{status} {run.counts.get(status, 0)}" for status in JOB_STATUSES)
+    active = f"  (en curso: {run.owner})" if run.active else ""
+    print(f"{run.id}  [{run.report_id}]  {run.created_at[:19]}  {counts}{active}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de ``python -m report_platform.jobs``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m report_platform.jobs",
+        description="Ejecuciones por lotes reanudables con estado persistente.",
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    run_parser = subparsers.add_parser("ejecutar", help="Crea y ejecuta una ejecución nueva")
+    run_parser.add_argument("report_id", help="ID del plugin de informe (p. ej. informe_auditoria)")
+    run_parser.add_argument("entrada", type=Path, help="Archivo de registros (.jsonl, .json, .csv, .yaml)")
+    run_parser.add_argument("--salida", type=Path, default=None,
+                            help="Directorio de salida (por defecto /mnt/user-data/outputs)")
+    run_parser.add_argument("--metadatos", action="store_true",
+                            help="Guardar metadatos de cada informe generado")
+    run_parser.add_argument("--procesos", type=int, default=1,
+                            help="Número de procesos en paralelo (0 = uno por CPU)")
+
+    resume_parser = subparsers.add_parser("reanudar", help="Reanuda una ejecución interrumpida")
+    resume_parser.add_argument("run_id", help="ID de la ejecución")
+    resume_parser.add_argument("--procesos", type=int, default=1,
+                               help="Número de procesos en paralelo (0 = uno por CPU)")
+    resume_parser.add_argument("--reintentar-fallidos", action="store_true",
+                               help="Volver a generar también los registros fallidos")
+
+    status_parser = subparsers.add_parser("estado", help="Muestra el estado de las ejecuciones")
+    status_parser.add_argument("run_id", nargs="?", default=None,
+                               help="ID de la ejecución (por defecto, las más recientes)")
+
+    args = parser.parse_args(argv)
+    queue = JobQueue()
+
+    if args.comando == "estado":
+        if args.run_id is None:
+            for run in queue.list_runs():
+                _print_run(run)
+            return 0
+
+        run = queue.get_run(args.run_id)
+        if run is None:
+            print(f"Ejecución no encontrada: {args.run_id}")
+            return 1
+        _print_run(run)
+        for job in queue.get_jobs(args.run_id, status=STATUS_FAILED):
+            print(f"❌ [{job.index}] {job.error}")
+        return 0
+
+    if args.comando == "ejecutar":
+        records = load_records(args.entrada)
+        run_id = queue.create_run(args.report_id, records, input_path=args.entrada,
+                                  output_dir=args.salida, save_meta=args.metadatos)
+        print(f"Ejecución: {run_id}")
+        run = run_jobs(queue, run_id, workers=args.procesos)
+    else:
+        if queue.get_run(args.run_id) is None:
+            print(f"Ejecución no encontrada: {args.run_id}")
+            return 1
+        try:
+            run = run_jobs(queue, args.run_id, workers=args.procesos,
+                           retry_failed=args.reintentar_fallidos)
+        except RunLockedError as e:
+            print(f"❌ {e}")
+            return 1
+
+    _print_run(run)
+    failed = run.counts.get(STATUS_FAILED, 0)
+    if failed:
+        print(f"Reintentar con: python -m report_platform.jobs reanudar {run.id} --reintentar-fallidos")
+    return 1 if failed or not run.finished else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,14 +26,19 @@ Uso:
 ================================================================================
 """
 
-import yaml
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from jinja2 import Environment, BaseLoader
+from typing import Dict, Any, List, Optional, Tuple, Callable, Set, FrozenSet
+from jinja2 import Environment, BaseLoader, meta
 import logging
 
 # Importar el evaluador de condiciones del core
-from report_platform.core.conditions_engine import evaluate_condition
+from report_platform.core.conditions_engine import (
+    compile_condition,
+    get_rule_index,
+    get_variables_in_expression,
+)
+from report_platform.core.utils import load_yaml
 
 # Configuración del logger
 logging.basicConfig(level=logging.INFO)
@@ -59,7 +64,13 @@ class BloquesTextoProcessor:
         self.config_dir = config_dir or Path(__file__).parent
         self.jinja_env = Environment(loader=BaseLoader())
         self.bloques_texto: List[Dict] = []
+        # texto de la plantilla -> función de renderizado precompilada
+        self._plantillas: Dict[str, Callable[[Dict[str, Any]], str]] = {}
+        # id de bloque -> variables que lee (None si no se pudieron determinar)
+        self._dependencias: Dict[str, Optional[FrozenSet[str]]] = {}
         self._load_config()
+        self._compilar_plantillas()
+        self._analizar_dependencias()
     
     def _load_config(self) -> None:
         """
@@ -69,7 +80,7 @@ class BloquesTextoProcessor:
         directorio de configuración del plugin.
         """
         # Buscar archivos de bloques (pueden estar divididos en partes)
-        yaml_files = list(self.config_dir.glob("bloques_texto*.yaml"))
+        yaml_files = _archivos_bloques(self.config_dir)
         
         if not yaml_files:
             logger.warning("No se encontraron archivos bloques_texto*.yaml")
@@ -78,7 +89,7 @@ class BloquesTextoProcessor:
         for yaml_file in sorted(yaml_files):
             try:
                 with open(yaml_file, 'r', encoding='utf-8') as f:
-                    content = yaml.safe_load(f)
+                    content = load_yaml(f)
                     if content and 'bloques_texto' in content:
                         self.bloques_texto.extend(content['bloques_texto'])
                     elif content and isinstance(content, list):
@@ -86,7 +97,103 @@ class BloquesTextoProcessor:
                         self.bloques_texto.extend(content)
             except Exception as e:
                 logger.error(f"Error cargando {yaml_file}: {e}")
+
+    def _compilar_plantillas(self) -> None:
+        """
+        Precompila las plantillas de todas las reglas cargadas.
+
+        Cada plantilla se compila una sola vez al cargar la configuración.
+        Las plantillas sin marcadores Jinja2 ({{, {%, {#) no pasan por Jinja:
+        se guardan como texto literal ya recortado.
+        """
+        for bloque in self.bloques_texto:
+            reglas = bloque.get('reglas', [])
+            for regla in reglas:
+                self._obtener_renderizador(regla.get('plantilla', ''))
+            # Construir también el índice de reglas del bloque
+            get_rule_index(tuple(regla.get('cuando', 'True') for regla in reglas))
+
+    def _obtener_renderizador(self, plantilla: str) -> Callable[[Dict[str, Any]], str]:
+        """
+        Devuelve la función de renderizado de una plantilla, compilándola si hace falta.
+
+        Una plantilla que no es texto (p. ej. ``plantilla:`` vacío en el YAML)
+        no impide cargar el plugin: el error se lanza al renderizarla, y
+        _renderizar_plantilla lo registra y devuelve "".
+
+        Args:
+            plantilla: Texto de la plantilla
+
+        Returns:
+            Función que recibe el contexto y devuelve el texto renderizado
+        """
+        if not isinstance(plantilla, str):
+            tipo = type(plantilla).__name__
+
+            def renderizador(contexto: Dict[str, Any]) -> str:
+                raise TypeError(f"La plantilla debe ser texto, no {tipo}")
+
+            return renderizador
+
+        renderizador = self._plantillas.get(plantilla)
+        if renderizador is not None:
+            return renderizador
+
+        if not any(marcador in plantilla for marcador in ('{{', '{%', '{#')):
+            literal = plantilla.strip()
+            renderizador = lambda contexto: literal
+        else:
+            try:
+                template = self.jinja_env.from_string(plantilla)
+                renderizador = lambda contexto: template.render(**contexto).strip()
+            except Exception as e:
+                error = e
+
+                def renderizador(contexto: Dict[str, Any]) -> str:
+                    raise error
+
+        self._plantillas[plantilla] = renderizador
+        return renderizador
     
+    def _analizar_dependencias(self) -> None:
+        """
+        Calcula qué variables del contexto lee cada bloque.
+
+        Une las variables de las condiciones ('cuando') con las variables no
+        declaradas de las plantillas Jinja2 de todas sus reglas.
+        """
+        for bloque in self.bloques_texto:
+            bloque_id = bloque.get('id')
+            if not bloque_id:
+                continue
+
+            variables: Set[str] = set()
+            try:
+                for regla in bloque.get('reglas', []):
+                    variables.update(get_variables_in_expression(regla.get('cuando', 'True')))
+                    plantilla = regla.get('plantilla', '')
+                    if isinstance(plantilla, str) and any(marcador in plantilla for marcador in ('{{', '{%')):
+                        ast_plantilla = self.jinja_env.parse(plantilla)
+                        variables.update(meta.find_undeclared_variables(ast_plantilla))
+            except Exception as e:
+                logger.warning(f"No se pudieron determinar dependencias del bloque '{bloque_id}': {e}")
+                self._dependencias[bloque_id] = None
+                continue
+
+            self._dependencias[bloque_id] = frozenset(variables)
+
+    def dependencias_bloque(self, bloque_id: str) -> Optional[FrozenSet[str]]:
+        """
+        Devuelve las variables de las que depende un bloque.
+
+        Args:
+            bloque_id: ID del bloque
+
+        Returns:
+            Conjunto de nombres de variables, o None si son desconocidas
+        """
+        return self._dependencias.get(bloque_id)
+
     def _evaluar_condicion(self, condicion: str, contexto: Dict[str, Any]) -> bool:
         """
         Evalúa una condición en el contexto dado usando el motor del core.
@@ -98,8 +205,8 @@ class BloquesTextoProcessor:
         Returns:
             True si la condición se cumple, False en caso contrario
         """
-        # Usar el evaluador seguro del core (basado en AST)
-        return evaluate_condition(condicion, contexto)
+        # Usar el evaluador seguro del core (AST compilado y cacheado)
+        return compile_condition(condicion).evaluate(contexto)
     
     def _renderizar_plantilla(self, plantilla: str, contexto: Dict[str, Any]) -> str:
         """
@@ -113,8 +220,7 @@ class BloquesTextoProcessor:
             Texto renderizado
         """
         try:
-            template = self.jinja_env.from_string(plantilla)
-            return template.render(**contexto).strip()
+            return self._obtener_renderizador(plantilla)(contexto)
         except Exception as e:
             logger.error(f"Error renderizando plantilla: {e}")
             return ""
@@ -133,14 +239,15 @@ class BloquesTextoProcessor:
         bloque_id = bloque.get('id', 'unknown')
         reglas = bloque.get('reglas', [])
         
-        for regla in reglas:
-            condicion = regla.get('cuando', 'True')
-            plantilla = regla.get('plantilla', '')
-            
-            if self._evaluar_condicion(condicion, contexto):
-                resultado = self._renderizar_plantilla(plantilla, contexto)
-                logger.debug(f"Bloque '{bloque_id}': condición '{condicion}' = True")
-                return resultado
+        # Seleccionar la primera regla que se cumple usando el índice del bloque
+        indice = get_rule_index(tuple(regla.get('cuando', 'True') for regla in reglas))
+        idx_regla = indice.select(contexto)
+        
+        if idx_regla is not None:
+            regla = reglas[idx_regla]
+            resultado = self._renderizar_plantilla(regla.get('plantilla', ''), contexto)
+            logger.debug(f"Bloque '{bloque_id}': condición '{regla.get('cuando', 'True')}' = True")
+            return resultado
         
         logger.debug(f"Bloque '{bloque_id}': ninguna condición coincidió")
         return ""
@@ -162,6 +269,106 @@ class BloquesTextoProcessor:
                 resultados[bloque_id] = self.procesar_bloque(bloque, contexto)
         return resultados
 
+    def procesar_cambios(self, contexto: Dict[str, Any], cambios: Set[str],
+                         previos: Dict[str, str]) -> Tuple[Dict[str, str], int]:
+        """
+        Procesa solo los bloques afectados por las variables modificadas.
+
+        Los bloques cuyas dependencias no intersectan con ``cambios`` reutilizan
+        el texto de ``previos``.
+
+        Args:
+            contexto: Diccionario con las variables del contexto
+            cambios: Nombres de variables cuyo valor cambió
+            previos: Resultados de la ejecución anterior (id_bloque -> texto)
+
+        Returns:
+            Tupla (id_bloque -> texto_renderizado, número de bloques re-renderizados)
+        """
+        resultados = {}
+        renderizados = 0
+        for bloque in self.bloques_texto:
+            bloque_id = bloque.get('id')
+            if not bloque_id:
+                continue
+
+            dependencias = self._dependencias.get(bloque_id)
+            if (bloque_id in previos and dependencias is not None
+                    and dependencias.isdisjoint(cambios)):
+                resultados[bloque_id] = previos[bloque_id]
+            else:
+                resultados[bloque_id] = self.procesar_bloque(bloque, contexto)
+                renderizados += 1
+        return resultados, renderizados
+
+
+# ==============================================================================
+# REGISTRO DE PROCESADORES POR DIRECTORIO DE CONFIGURACIÓN
+# ==============================================================================
+
+# config_dir -> (firma de los YAML, procesador ya cargado)
+_procesadores: Dict[Path, Tuple[Tuple, BloquesTextoProcessor]] = {}
+_procesadores_lock = threading.Lock()
+
+
+def _archivos_bloques(config_dir: Path) -> List[Path]:
+    """Devuelve los archivos bloques_texto*.yaml de un directorio, ordenados."""
+    return sorted(config_dir.glob("bloques_texto*.yaml"))
+
+
+def _firma_bloques(config_dir: Path) -> Tuple:
+    """
+    Calcula la firma (nombre, mtime, tamaño) de los YAML de bloques.
+
+    Args:
+        config_dir: Directorio de configuración
+
+    Returns:
+        Tupla que cambia si algún archivo se añade, elimina o modifica
+    """
+    firma = []
+    for yaml_file in _archivos_bloques(config_dir):
+        try:
+            stat = yaml_file.stat()
+        except OSError:
+            continue
+        firma.append((yaml_file.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(firma)
+
+
+def obtener_procesador(config_dir: Optional[Path] = None) -> BloquesTextoProcessor:
+    """
+    Devuelve el procesador de bloques de un directorio, reutilizándolo entre llamadas.
+
+    El procesador se comparte en todo el proceso (sesiones de Streamlit,
+    workers de lotes) y solo se vuelve a cargar si cambia la fecha de
+    modificación o el tamaño de algún bloques_texto*.yaml.
+
+    Args:
+        config_dir: Directorio donde están los archivos YAML (opcional)
+
+    Returns:
+        BloquesTextoProcessor con la configuración cargada
+    """
+    directorio = Path(config_dir or Path(__file__).parent).resolve()
+    firma = _firma_bloques(directorio)
+
+    with _procesadores_lock:
+        entrada = _procesadores.get(directorio)
+        if entrada is not None and entrada[0] == firma:
+            return entrada[1]
+
+        procesador = BloquesTextoProcessor(directorio)
+        _procesadores[directorio] = (firma, procesador)
+        logger.info(f"Bloques de texto cargados desde {directorio}")
+        return procesador
+
+
+def limpiar_cache_procesadores() -> None:
+    """Descarta todos los procesadores cacheados."""
+    with _procesadores_lock:
+        _procesadores.clear()
+
 
 def calcular_variables_auxiliares(data_in: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -326,6 +533,30 @@ def calcular_variables_auxiliares(data_in: Dict[str, Any]) -> Dict[str, Any]:
     return aux
 
 
+def _construir_contexto_base(data_in: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Construye el contexto previo al procesamiento de bloques de texto.
+
+    Args:
+        data_in: Datos de entrada del usuario
+
+    Returns:
+        Datos de entrada más variables auxiliares y año anterior
+    """
+    # 1. Iniciar con los datos de entrada
+    context = dict(data_in)
+    
+    # 2. Calcular variables auxiliares
+    auxiliares = calcular_variables_auxiliares(data_in)
+    context.update(auxiliares)
+    
+    # 3. Calcular año anterior si no está presente
+    if 'ano_cierre_ejercicio' in context and 'ano_cierre_anterior' not in context:
+        context['ano_cierre_anterior'] = context['ano_cierre_ejercicio'] - 1
+    
+    return context
+
+
 def build_context(data_in: Dict[str, Any], config_dir: Optional[Path] = None) -> Dict[str, Any]:
     """
     Construye el contexto completo para la plantilla Word.
@@ -356,19 +587,11 @@ def build_context(data_in: Dict[str, Any], config_dir: Optional[Path] = None) ->
         >>> context = build_context(data_in)
         >>> # context['parrafo_opinion'] contiene el párrafo de opinión renderizado
     """
-    # 1. Iniciar con los datos de entrada
-    context = dict(data_in)
-    
-    # 2. Calcular variables auxiliares
-    auxiliares = calcular_variables_auxiliares(data_in)
-    context.update(auxiliares)
-    
-    # 3. Calcular año anterior si no está presente
-    if 'ano_cierre_ejercicio' in context and 'ano_cierre_anterior' not in context:
-        context['ano_cierre_anterior'] = context['ano_cierre_ejercicio'] - 1
+    # 1-3. Datos de entrada, variables auxiliares y año anterior
+    context = _construir_contexto_base(data_in)
     
     # 4. Procesar todos los bloques de texto
-    processor = BloquesTextoProcessor(config_dir)
+    processor = obtener_procesador(config_dir)
     bloques_renderizados = processor.procesar_todos(context)
     context.update(bloques_renderizados)
     
@@ -376,6 +599,77 @@ def build_context(data_in: Dict[str, Any], config_dir: Optional[Path] = None) ->
     return context
 
 
+class IncrementalContextBuilder:
+    """
+    Constructor de contexto incremental.
+
+    Conserva el contexto de la construcción anterior y, en cada llamada,
+    solo vuelve a renderizar los bloques de texto que leen alguna variable
+    cuyo valor ha cambiado. El resultado es idéntico al de build_context().
+
+    Uso:
+        builder = IncrementalContextBuilder(config_dir)
+        context = builder.build(data_in)   # primera vez: todos los bloques
+        context = builder.build(data_in2)  # solo los bloques afectados
+    """
+
+    _SIN_VALOR = object()
+
+    def __init__(self, config_dir: Optional[Path] = None):
+        """
+        Inicializa el constructor.
+
+        Args:
+            config_dir: Directorio donde están los archivos YAML (opcional)
+        """
+        self.config_dir = config_dir
+        self._procesador: Optional[BloquesTextoProcessor] = None
+        self._contexto_base: Dict[str, Any] = {}
+        self._bloques: Dict[str, str] = {}
+
+    def reset(self) -> None:
+        """Descarta el estado previo; la siguiente construcción será completa."""
+        self._procesador = None
+        self._contexto_base = {}
+        self._bloques = {}
+
+    def build(self, data_in: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Construye el contexto completo reutilizando los bloques no afectados.
+
+        Args:
+            data_in: Diccionario con los valores introducidos por el usuario
+
+        Returns:
+            Diccionario con todas las variables listas para la plantilla
+        """
+        context = _construir_contexto_base(data_in)
+        processor = obtener_procesador(self.config_dir)
+
+        if processor is not self._procesador:
+            # Configuración nueva o recargada: procesar todo
+            bloques = processor.procesar_todos(context)
+            renderizados = len(bloques)
+        else:
+            previo = self._contexto_base
+            cambios = {
+                clave for clave in previo.keys() | context.keys()
+                if previo.get(clave, self._SIN_VALOR) != context.get(clave, self._SIN_VALOR)
+            }
+            bloques, renderizados = processor.procesar_cambios(context, cambios, self._bloques)
+
+        self._procesador = processor
+        self._contexto_base = dict(context)
+        self._bloques = bloques
+
+        context.update(bloques)
+        logger.info(
+            f"Contexto construido con {len(context)} variables "
+            f"({renderizados}/{len(bloques)} bloques renderizados)"
+        )
+        return context
+
+
 # ==============================================================================
 # EJEMPLO DE USO Y PRUEBAS
 # ==============================================================================
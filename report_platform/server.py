@@ -0,0 +1,484 @@
+"""
+Server - Servicio HTTP local para generar informes sin interfaz
+
+Servidor asyncio (solo biblioteca estándar) que permite a otros sistemas
+listar plugins, construir contextos y generar documentos Word por HTTP,
+sin una sesión de Streamlit detrás de cada llamada.
+
+El trabajo pesado (construcción del contexto y renderizado del .docx) se
+ejecuta en un pool de procesos; cada proceso carga cada plugin una sola vez.
+El documento se devuelve en streaming (Transfer-Encoding: chunked).
+
+Endpoints:
+    GET  /health                        -> {"status": "ok"}
+    GET  /plugins                       -> lista de plugins disponibles
+    GET  /plugins/<id>                  -> información del plugin
+    POST /plugins/<id>/context          -> contexto (JSON) para los datos enviados
+    POST /plugins/<id>/render           -> documento .docx para los datos enviados
+
+Errores: 400 petición mal formada, 404 plugin o ruta inexistente, 422 datos
+de entrada no válidos para el plugin, 500 error interno (el detalle solo se
+registra en el log), 503 el pool de procesos se ha recreado tras una caída.
+
+Uso:
+    python -m report_platform.server --puerto 8765 --procesos 4
+    curl -X POST -d @datos.json http://127.0.0.1:8765/plugins/informe_auditoria/render -o informe.docx
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from http import HTTPStatus
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from report_platform.core.utils import setup_logger, safe_filename
+
+logger = setup_logger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Límites de la petición HTTP
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 10 * 1024 * 1024
+
+# Tamaño de los trozos del documento enviados en streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class HTTPError(Exception):
+    """Error que se devuelve al cliente con un código HTTP."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class RecordError(Exception):
+    """Los datos enviados por el cliente no son válidos para el plugin (422)."""
+
+
+# ==============================================================================
+# TRABAJO EN LOS PROCESOS DEL POOL
+# ==============================================================================
+
+# Generadores del proceso worker, uno por plugin, creados en el primer uso
+_worker_generators: Dict[str, Any] = {}
+
+
+def _worker_generator(report_id: str):
+    """Devuelve el generador del plugin en este proceso (cargándolo una vez)."""
+    generator = _worker_generators.get(report_id)
+    if generator is None:
+        from report_platform.batch import BatchGenerator
+        generator = BatchGenerator(report_id)
+        _worker_generators[report_id] = generator
+    return generator
+
+
+def _init_worker(report_ids: List[str]) -> None:
+    """Precarga en el worker los plugins y sus plantillas Word."""
+    from report_platform.core.word_engine import warm_docx_template
+
+    for report_id in report_ids:
+        try:
+            warm_docx_template(_worker_generator(report_id).template_path)
+        except Exception as e:
+            logger.warning(f"No se pudo precargar el plugin {report_id}: {e}")
+
+
+def _build_in_worker(report_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Construye el contexto de un registro en el worker.
+
+    Raises:
+        RecordError: Si los datos no son válidos (campos numéricos con
+            valores no numéricos o datos que build_context no puede procesar)
+    """
+    from report_platform.batch import coerce_record
+
+    generator = _worker_generator(report_id)
+    simple_fields = generator.plugin_config['simple_fields']
+    data_in = coerce_record(data, simple_fields)
+
+    invalid = [
+        field.id for field in simple_fields
+        if field.tipo == "numero" and field.id in data_in
+        and (isinstance(data_in[field.id], bool)
+             or not isinstance(data_in[field.id], (int, float)))
+    ]
+    if invalid:
+        raise RecordError(f"Campos numéricos con valores no numéricos: {', '.join(invalid)}")
+
+    try:
+        return generator.build(data_in)
+    except (TypeError, ValueError) as e:
+        raise RecordError(f"Datos de entrada no válidos para {report_id}: {e}")
+
+
+def _render_in_worker(report_id: str, data: Dict[str, Any]) -> Tuple[Optional[bytes], str]:
+    """Construye el contexto y renderiza el documento en el worker."""
+    from report_platform.core.word_engine import render_word_report_bytes
+
+    generator = _worker_generator(report_id)
+    context = _build_in_worker(report_id, data)
+    return render_word_report_bytes(generator.template_path, context), generator.manifest.id
+
+
+# ==============================================================================
+# PROTOCOLO HTTP
+# ==============================================================================
+
+class Request:
+    """Petición HTTP ya leída."""
+
+    def __init__(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Dict[str, Any]:
+        """Cuerpo de la petición como objeto JSON (vacío si no hay cuerpo)."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"JSON inválido: {e}")
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "El cuerpo debe ser un objeto JSON")
+        return data
+
+
+async def read_request(reader: asyncio.StreamReader,
+                       writer: Optional[asyncio.StreamWriter] = None) -> Request:
+    """
+    Lee una petición HTTP/1.1 (línea inicial, cabeceras y cuerpo).
+
+    Si el cliente envía ``Expect: 100-continue`` (curl lo hace con cuerpos de
+    más de 1 KB) se responde ``100 Continue`` antes de leer el cuerpo, para
+    que el cliente no espere a que venza su temporizador.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeceras demasiado grandes")
+
+    lines = head.decode('latin-1').split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Línea de petición inválida")
+
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length inválido")
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Cuerpo demasiado grande")
+
+    if length and writer is not None and headers.get('expect', '').lower() == '100-continue':
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        await writer.drain()
+
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), urlsplit(target).path, headers, body)
+
+
+async def send_response(writer: asyncio.StreamWriter, status: HTTPStatus, body: bytes,
+                        content_type: str = "application/json; charset=utf-8",
+                        extra_headers: Optional[Dict[str, str]] = None) -> None:
+    """Envía una respuesta completa."""
+    headers = {
+        'Content-Type': content_type,
+        'Content-Length': str(len(body)),
+        'Connection': 'close',
+        **(extra_headers or {}),
+    }
+    writer.write(_status_line(status) + _format_headers(headers) + body)
+    await writer.drain()
+
+
+async def send_json(writer: asyncio.StreamWriter, status: HTTPStatus, data: Any) -> None:
+    """Envía una respuesta JSON."""
+    body = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+    await send_response(writer, status, body)
+
+
+async def send_stream(writer: asyncio.StreamWriter, data: bytes, content_type: str,
+                      extra_headers: Optional[Dict[str, str]] = None) -> None:
+    """Envía un cuerpo en streaming con Transfer-Encoding: chunked."""
+    headers = {
+        'Content-Type': content_type,
+        'Transfer-Encoding': 'chunked',
+        'Connection': 'close',
+        **(extra_headers or {}),
+    }
+    writer.write(_status_line(HTTPStatus.OK) + _format_headers(headers))
+
+    view = memoryview(data)
+    for start in range(0, len(view), STREAM_CHUNK_SIZE):
+        chunk = view[start:start + STREAM_CHUNK_SIZE]
+        writer.write(f"{len(chunk):X}\r\n".encode('ascii') + bytes(chunk) + b"\r\n")
+        await writer.drain()
+
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+def _status_line(status: HTTPStatus) -> bytes:
+    return f"HTTP/1.1 {status.value} {status.phrase}\r\n".encode('ascii')
+
+
+def _format_headers(headers: Dict[str, str]) -> bytes:
+    return "".join(f"{name}: {value}\r\n" for name, value in headers.items()).encode('latin-1') + b"\r\n"
+
+
+# ==============================================================================
+# SERVIDOR
+# ==============================================================================
+
+class ReportServer:
+    """
+    Servicio HTTP de generación de informes.
+
+    Las rutas de consulta (listado e información de plugins) se resuelven en
+    el proceso principal con los índices compartidos del router; la
+    construcción de contextos y el renderizado se envían al pool de procesos.
+    """
+
+    def __init__(self, workers: int = 0, preload: bool = True):
+        """
+        Crea el pool de procesos.
+
+        Args:
+            workers: Número de procesos (0 = uno por CPU)
+            preload: Si cada proceso debe precargar todos los plugins al arrancar
+        """
+        from report_platform.ui.router import list_available_reports
+
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.report_ids = [m.id for m in list_available_reports()] if preload else []
+        self.executor = self._create_executor()
+        self._executor_lock = asyncio.Lock()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.report_ids,),
+        )
+
+    def close(self) -> None:
+        """Detiene el pool de procesos."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _replace_broken_executor(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Sustituye el pool si un worker ha muerto (p. ej. por falta de memoria).
+
+        Varias peticiones pueden detectar la misma caída a la vez; solo la
+        primera crea el pool nuevo.
+        """
+        async with self._executor_lock:
+            if self.executor is not broken:
+                return
+            logger.error("Un proceso del pool ha terminado de forma inesperada; se recrea el pool")
+            self.executor = self._create_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run_in_pool(self, func, *args) -> Any:
+        """
+        Ejecuta una función en el pool sin bloquear el bucle de eventos.
+
+        Si el pool está roto (murió un worker) se recrea y se reintenta una
+        vez; si vuelve a fallar se responde 503.
+        """
+        loop = asyncio.get_running_loop()
+        for _ in range(2):
+            executor = self.executor
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                await self._replace_broken_executor(executor)
+
+        raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE,
+                        "El proceso de renderizado ha terminado de forma inesperada; reintentar")
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Atiende una conexión (una petición por conexión)."""
+        try:
+            try:
+                request = await read_request(reader, writer)
+                await self.dispatch(request, writer)
+            except HTTPError as e:
+                await send_json(writer, e.status, {'error': e.message})
+            except RecordError as e:
+                await send_json(writer, HTTPStatus.UNPROCESSABLE_ENTITY, {'error': str(e)})
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            except Exception:
+                # El detalle solo va al log; el cliente recibe un mensaje genérico
+                import traceback
+                logger.error(f"Error atendiendo petición:\n{traceback.format_exc()}")
+                await send_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR,
+                                {'error': "Error interno del servidor"})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def dispatch(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        """Enruta la petición a su manejador."""
+        parts = [p for p in request.path.split("/") if p]
+
+        if parts == ['health'] and request.method == 'GET':
+            await send_json(writer, HTTPStatus.OK, {'status': 'ok', 'workers': self.workers})
+            return
+
+        if parts == ['plugins'] and request.method == 'GET':
+            await send_json(writer, HTTPStatus.OK, await asyncio.to_thread(self.list_plugins))
+            return
+
+        if len(parts) in (2, 3) and parts[0] == 'plugins':
+            report_id = parts[1]
+            action = parts[2] if len(parts) == 3 else None
+            # Índice de manifests y carga del plugin leen disco: fuera del bucle de eventos
+            manifest = await asyncio.to_thread(self.get_manifest, report_id)
+
+            if action is None and request.method == 'GET':
+                info = await asyncio.to_thread(self.plugin_info, report_id, manifest)
+                await send_json(writer, HTTPStatus.OK, info)
+                return
+
+            if action == 'context' and request.method == 'POST':
+                context = await self.run_in_pool(_build_in_worker, report_id, request.json())
+                await send_json(writer, HTTPStatus.OK, context)
+                return
+
+            if action == 'render' and request.method == 'POST':
+                await self.render(report_id, request, writer)
+                return
+
+            if action in (None, 'context', 'render'):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"Método no permitido: {request.method}")
+
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Ruta no encontrada: {request.path}")
+
+    def list_plugins(self) -> List[Dict[str, Any]]:
+        """Resumen de los plugins disponibles."""
+        from report_platform.ui.router import list_available_reports
+
+        return [
+            {'id': m.id, 'nombre': m.nombre, 'version': m.version, 'descripcion': m.descripcion}
+            for m in list_available_reports()
+        ]
+
+    def get_manifest(self, report_id: str):
+        """Manifest de un plugin o 404 si no existe."""
+        from report_platform.ui.router import get_report_manifest
+
+        manifest = get_report_manifest(report_id)
+        if manifest is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Plugin no encontrado: {report_id}")
+        return manifest
+
+    def plugin_info(self, report_id: str, manifest) -> Dict[str, Any]:
+        """Información de un plugin, con sus campos de entrada."""
+        from report_platform.ui.router import load_report_plugin
+
+        plugin_config = load_report_plugin(report_id)
+        if not plugin_config:
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, f"Error cargando plugin: {report_id}")
+
+        return {
+            'id': manifest.id,
+            'nombre': manifest.nombre,
+            'version': manifest.version,
+            'descripcion': manifest.descripcion,
+            'campos': [field.model_dump() for field in plugin_config['simple_fields']],
+            'variables_condicionales': [var.model_dump() for var in plugin_config['conditional_variables']],
+        }
+
+    async def render(self, report_id: str, request: Request,
+                     writer: asyncio.StreamWriter) -> None:
+        """Renderiza el documento en el pool y lo devuelve en streaming."""
+        data, manifest_id = await self.run_in_pool(_render_in_worker, report_id, request.json())
+        if data is None:
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, "No se pudo renderizar el documento")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = safe_filename(f"{manifest_id}_{timestamp}.docx")
+        await send_stream(writer, data, DOCX_CONTENT_TYPE,
+                          {'Content-Disposition': f'attachment; filename="{filename}"'})
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 0) -> None:
+    """
+    Arranca el servicio y atiende peticiones hasta que se interrumpa.
+
+    Args:
+        host: Dirección en la que escuchar
+        port: Puerto
+        workers: Número de procesos de renderizado (0 = uno por CPU)
+    """
+    report_server = ReportServer(workers)
+    server = await asyncio.start_server(report_server.handle_connection, host, port,
+                                        limit=MAX_HEADER_SIZE)
+
+    logger.info(f"Servidor de informes escuchando en http://{host}:{port} "
+                f"({report_server.workers} procesos)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        report_server.close()
+
+
+# ==============================================================================
+# LÍNEA DE COMANDOS
+# ==============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de ``python -m report_platform.server``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m report_platform.server",
+        description="Servicio HTTP local para generar informes sin interfaz.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Dirección (por defecto {DEFAULT_HOST})")
+    parser.add_argument("--puerto", type=int, default=DEFAULT_PORT,
+                        help=f"Puerto (por defecto {DEFAULT_PORT})")
+    parser.add_argument("--procesos", type=int, default=0,
+                        help="Procesos de renderizado (0 = uno por CPU)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.puerto, args.procesos))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@ Incluye funcionalidad de metadatos para guardar y cargar configuraciones.
 
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 import streamlit as st
@@ -18,8 +18,8 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from report_platform.core.utils import setup_logger, get_outputs_dir, safe_filename
-from report_platform.core.config_loader import get_fields_by_section, get_general_config
-from report_platform.core.word_engine import render_word_report
+from report_platform.core.config_loader import get_fields_by_section
+from report_platform.core.word_engine import render_word_report_bytes, save_report_bytes
 from report_platform.core.ui_runtime import (
     render_field,
     render_conditional_variable,
@@ -31,20 +31,24 @@ from report_platform.core.ui_runtime import (
 from report_platform.core.metadata import (
     create_metadata,
     save_metadata,
-    load_all_metadata,
-    load_metadata_by_report_id,
+    load_latest_metadata,
+    count_metadata,
+    list_metadata_report_ids,
     get_metadata_summary,
 )
 from report_platform.ui.router import (
     list_available_reports,
-    load_report_plugin,
     get_build_context_function,
     get_template_path,
     get_plugin_info,
 )
+from report_platform.ui.resources import get_plugin_resources
 
 logger = setup_logger(__name__)
 
+# Registros de metadatos por página en el modo "cargar"
+METADATA_PAGE_SIZE = 50
+
 
 # ==============================================================================
 # CONFIGURACIÓN DE LA PÁGINA
@@ -70,6 +74,9 @@ def init_session_state():
     if 'plugin_config' not in st.session_state:
         st.session_state.plugin_config = None
 
+    if 'context_builder' not in st.session_state:
+        st.session_state.context_builder = None
+
     if 'form_data' not in st.session_state:
         st.session_state.form_data = {}
 
@@ -146,15 +153,14 @@ def render_sidebar():
     else:
         st.sidebar.subheader("📂 Cargar desde metadatos")
 
-        # Cargar todos los metadatos
-        all_metadata = load_all_metadata()
+        # Tipos de informe con metadatos (consulta indexada, sin cargar registros)
+        report_ids_with_meta = list_metadata_report_ids()
 
-        if not all_metadata:
+        if not report_ids_with_meta:
             st.sidebar.warning("No hay metadatos guardados")
             return None, None
 
         # Primero seleccionar tipo de informe
-        report_ids_with_meta = list(set([m.report_id for m in all_metadata]))
         report_names_map = {r.id: r.nombre for r in available_reports}
 
         selected_report_id = st.sidebar.selectbox(
@@ -164,8 +170,24 @@ def render_sidebar():
             key="report_selector_cargar"
         )
 
-        # Filtrar metadatos por tipo de informe
-        filtered_metadata = [m for m in all_metadata if m.report_id == selected_report_id]
+        # Cargar solo una página de los registros más recientes
+        total = count_metadata(selected_report_id)
+        total_pages = max(1, -(-total // METADATA_PAGE_SIZE))
+        page = 1
+        if total_pages > 1:
+            page = st.sidebar.number_input(
+                f"Página (de {total_pages})",
+                min_value=1,
+                max_value=total_pages,
+                value=1,
+                key="metadata_page"
+            )
+
+        filtered_metadata = load_latest_metadata(
+            limit=METADATA_PAGE_SIZE,
+            offset=(page - 1) * METADATA_PAGE_SIZE,
+            report_id=selected_report_id,
+        )
 
         if not filtered_metadata:
             st.sidebar.warning(f"No hay metadatos para '{selected_report_id}'")
@@ -283,10 +305,11 @@ def render_simple_fields_section(
     # Agrupar por sección
     fields_by_section = get_fields_by_section(simple_fields)
 
-    # Obtener orden de secciones si está definido
+    # Obtener orden de secciones si está definido (ya cargado con el plugin)
     config_dir = plugin_config['config_dir']
-    general_config = get_general_config(config_dir)
+    general_config = plugin_config.get('general_config') or {}
     sections_order = general_config.get('secciones_orden', [])
+    date_group_labels = plugin_config.get('date_group_labels')
 
     # Determinar orden
     if sections_order:
@@ -311,6 +334,7 @@ def render_simple_fields_section(
                 fields=fields_by_section[section],
                 context=context,
                 config_dir=config_dir,
+                date_group_labels=date_group_labels,
             )
             all_values.update(section_values)
 
@@ -346,25 +370,32 @@ def render_tables_section(plugin_config: Dict[str, Any], context: Dict[str, Any]
 # ==============================================================================
 
 def generate_report(plugin_config: Dict[str, Any], form_data: Dict[str, Any],
-                   save_meta: bool = True) -> Optional[Path]:
+                   save_meta: bool = True,
+                   context_builder: Optional[Any] = None) -> Optional[Tuple[Path, bytes]]:
     """
     Genera el informe usando el plugin y los datos del formulario.
 
+    El documento se renderiza en memoria; se guarda una copia en el directorio
+    de salida y los bytes se devuelven para la descarga sin volver a leerlo.
+
     Args:
         plugin_config: Configuración del plugin
         form_data: Datos del formulario
         save_meta: Si debe guardar metadatos
+        context_builder: Constructor incremental de la sesión (opcional)
 
     Returns:
-        Path al archivo generado o None si hay error
+        Tupla (path al archivo generado, contenido del documento) o None si hay error
     """
     try:
-        # Obtener función build_context
-        build_context = get_build_context_function(plugin_config)
-
-        # Construir contexto
-        logger.info("Construyendo contexto con build_context()...")
-        context = build_context(form_data, plugin_config['config_dir'])
+        # Construir contexto (incremental si el plugin lo soporta)
+        if context_builder is not None:
+            logger.info("Construyendo contexto de forma incremental...")
+            context = context_builder.build(form_data)
+        else:
+            build_context = get_build_context_function(plugin_config)
+            logger.info("Construyendo contexto con build_context()...")
+            context = build_context(form_data, plugin_config['config_dir'])
 
         # Obtener path de plantilla
         template_path = get_template_path(plugin_config)
@@ -374,9 +405,14 @@ def generate_report(plugin_config: Dict[str, Any], form_data: Dict[str, Any],
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_filename = f"{manifest.id}_{timestamp}"
 
-        # Renderizar informe
+        # Renderizar informe en memoria y guardar copia en disco
         logger.info("Renderizando informe...")
-        output_path = render_word_report(template_path, context, output_filename)
+        document_data = render_word_report_bytes(template_path, context)
+        if document_data is None:
+            st.error("No se pudo renderizar el documento Word")
+            return None
+
+        output_path = save_report_bytes(document_data, output_filename)
 
         # Guardar metadatos si se solicita
         if save_meta:
@@ -392,7 +428,7 @@ def generate_report(plugin_config: Dict[str, Any], form_data: Dict[str, Any],
             save_metadata(metadata)
             logger.info(f"Metadatos guardados: {metadata.id}")
 
-        return output_path
+        return output_path, document_data
 
     except Exception as e:
         logger.error(f"Error generando informe: {e}")
@@ -424,15 +460,19 @@ def main():
     if (st.session_state.selected_report != selected_report_id or
         st.session_state.plugin_config is None):
 
+        # Recursos compartidos por todas las sesiones del servidor
         with st.spinner(f"Cargando configuración de {selected_report_id}..."):
-            plugin_config = load_report_plugin(selected_report_id)
+            resources = get_plugin_resources(selected_report_id)
 
-        if not plugin_config:
+        if not resources:
             st.error(f"Error cargando plugin: {selected_report_id}")
             st.stop()
 
+        plugin_config = resources.plugin_config
+
         st.session_state.selected_report = selected_report_id
         st.session_state.plugin_config = plugin_config
+        st.session_state.context_builder = resources.new_context_builder()
 
         # Si estamos en modo cargar y tenemos metadata, prellenar form_data
         if st.session_state.work_mode == 'cargar' and selected_metadata:
@@ -556,23 +596,26 @@ def main():
             else:
                 # Generar informe
                 with st.spinner("Generando informe..."):
-                    output_path = generate_report(plugin_config, context, save_meta=True)
-
-                if output_path:
+                    result = generate_report(
+                        plugin_config,
+                        context,
+                        save_meta=True,
+                        context_builder=st.session_state.context_builder,
+                    )
+
+                if result:
+                    output_path, document_data = result
                     show_success_message(f"✅ Informe generado exitosamente")
 
                     st.info(f"**Archivo:** `{output_path.name}`")
                     st.info(f"**Ubicación:** `{output_path}`")
                     st.success("💾 Metadatos guardados para futura reutilización")
 
-                    # Botón de descarga
+                    # Botón de descarga (con los bytes ya renderizados)
                     try:
-                        with open(output_path, 'rb') as f:
-                            file_data = f.read()
-
                         st.download_button(
                             label="📥 Descargar Informe",
-                            data=file_data,
+                            data=document_data,
                             file_name=output_path.name,
                             mime='application/octet-stream',
                             use_container_width=True
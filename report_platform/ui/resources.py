@@ -0,0 +1,135 @@
+"""
+Resources - Recursos compartidos entre sesiones de Streamlit
+
+Mantiene una única copia por proceso del servidor de todo lo que es costoso
+de preparar para un plugin: configuración validada, módulo de lógica,
+condiciones y plantillas de texto compiladas, y plantilla Word preprocesada.
+Se apoya en st.cache_resource, de modo que la primera sesión que abre un
+plugin paga la carga y el resto reutiliza los mismos objetos.
+
+El estado de cada sesión (st.session_state) solo guarda referencias a estos
+objetos; no deben modificarse.
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Callable
+
+import streamlit as st
+
+from report_platform.core.utils import setup_logger, get_reports_dir
+from report_platform.core.word_engine import warm_docx_template
+from report_platform.ui.router import (
+    load_report_plugin,
+    get_plugin_dir,
+    get_build_context_function,
+    create_context_builder,
+    get_template_path,
+)
+
+logger = setup_logger(__name__)
+
+# Versiones de plugin (firmas distintas) que se mantienen en caché
+MAX_CACHED_PLUGINS = 32
+
+
+# ==============================================================================
+# RECURSOS DE UN PLUGIN
+# ==============================================================================
+
+class PluginResources:
+    """
+    Recursos de un plugin listos para usar, compartidos por todas las sesiones.
+
+    Attributes:
+        report_id: ID del plugin
+        plugin_config: Configuración completa (manifest, campos, bloques, logic_module...)
+        template_path: Path a la plantilla Word (ya preprocesada en caché)
+        build_context: Función build_context del plugin
+    """
+
+    def __init__(self, report_id: str, plugin_config: Dict[str, Any]):
+        self.report_id = report_id
+        self.plugin_config = plugin_config
+        self.template_path: Path = get_template_path(plugin_config)
+        self.build_context: Callable = get_build_context_function(plugin_config)
+
+    def new_context_builder(self) -> Optional[Any]:
+        """
+        Crea un constructor de contexto incremental para una sesión.
+
+        El constructor guarda el último contexto de la sesión, por eso no se
+        comparte; el procesador de bloques que usa sí es compartido.
+        """
+        return create_context_builder(self.plugin_config)
+
+    def warm(self) -> None:
+        """
+        Precompila condiciones, plantillas de texto y la plantilla Word.
+
+        Las condiciones y plantillas de texto solo se precompilan si el
+        plugin expone ``obtener_procesador(config_dir)`` en su logic.py; el
+        procesador queda en el registro del módulo y lo reutilizan todas
+        las sesiones.
+        """
+        logic_module = self.plugin_config.get('logic_module')
+        get_processor = getattr(logic_module, 'obtener_procesador', None)
+        if get_processor is not None:
+            get_processor(self.plugin_config['config_dir'])
+        warm_docx_template(self.template_path)
+
+
+def _plugin_signature(report_id: str) -> Tuple:
+    """
+    Firma (archivo, mtime, tamaño) de los archivos de un plugin.
+
+    Si cualquier archivo del plugin cambia, la firma cambia y
+    get_plugin_resources vuelve a preparar los recursos.
+    """
+    plugin_dir = get_plugin_dir(report_id) or get_reports_dir() / report_id
+    signature = []
+
+    for filepath in sorted(plugin_dir.rglob("*")):
+        if filepath.suffix not in ('.yaml', '.py', '.docx') or '__pycache__' in filepath.parts:
+            continue
+        try:
+            stat = filepath.stat()
+        except OSError:
+            continue
+        signature.append((str(filepath.relative_to(plugin_dir)), stat.st_mtime_ns, stat.st_size))
+
+    return tuple(signature)
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_PLUGINS)
+def _load_plugin_resources(report_id: str, signature: Tuple) -> Optional[PluginResources]:
+    """Prepara los recursos de un plugin (una vez por proceso y firma)."""
+    plugin_config = load_report_plugin(report_id)
+    if not plugin_config:
+        return None
+
+    resources = PluginResources(report_id, plugin_config)
+    try:
+        resources.warm()
+    except Exception as e:
+        logger.warning(f"No se pudieron precalentar los recursos de {report_id}: {e}")
+
+    logger.info(f"Recursos compartidos preparados para plugin: {report_id}")
+    return resources
+
+
+def get_plugin_resources(report_id: str) -> Optional[PluginResources]:
+    """
+    Obtiene los recursos compartidos de un plugin.
+
+    Args:
+        report_id: ID del plugin
+
+    Returns:
+        PluginResources o None si el plugin no se pudo cargar
+    """
+    return _load_plugin_resources(report_id, _plugin_signature(report_id))
+
+
+def clear_plugin_resources() -> None:
+    """Descarta todos los recursos compartidos (se recargarán bajo demanda)."""
+    _load_plugin_resources.clear()
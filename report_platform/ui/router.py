@@ -2,16 +2,25 @@
 Router - Descubrimiento y carga de plugins de informes
 
 Escanea el directorio de reports y carga dinámicamente los plugins disponibles.
+
+Los manifests se indexan una sola vez por proceso (índice compartido entre
+sesiones de Streamlit). El índice se revalida como mucho cada
+MANIFEST_INDEX_TTL segundos comparando el mtime del directorio reports/ y
+el mtime/tamaño de cada manifest.yaml; solo se reconstruye si algo cambió.
 """
 
+import os
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from report_platform.core.utils import setup_logger, get_reports_dir
 from report_platform.core.config_loader import (
     load_manifest, 
     load_plugin_config
 )
 from report_platform.core.schema_models import Manifest
+from report_platform.core.truth_tables import load_truth_tables
 
 logger = setup_logger(__name__)
 
@@ -20,38 +29,152 @@ logger = setup_logger(__name__)
 # DESCUBRIMIENTO DE PLUGINS
 # ==============================================================================
 
+# Segundos durante los que el índice se usa sin consultar el sistema de archivos
+MANIFEST_INDEX_TTL = 2.0
+
+
+class _ManifestIndex:
+    """Manifests de los plugins disponibles, indexados por id."""
+    __slots__ = ('reports_mtime_ns', 'signature', 'manifests', 'by_id', 'dirs', 'checked_at')
+
+    def __init__(self, reports_mtime_ns: int, signature: Tuple,
+                 manifests: List[Manifest], dirs: Dict[str, Path]):
+        self.reports_mtime_ns = reports_mtime_ns
+        self.signature = signature
+        self.manifests = manifests
+        self.by_id = {manifest.id: manifest for manifest in manifests}
+        self.dirs = dirs
+        self.checked_at = time.monotonic()
+
+
+_manifest_index: Optional[_ManifestIndex] = None
+_manifest_index_lock = threading.Lock()
+
+
+def _list_plugin_dirs(reports_dir: Path) -> List[Path]:
+    """Subdirectorios de reports/ que pueden ser plugins, en orden estable."""
+    return sorted(
+        Path(entry.path) for entry in os.scandir(reports_dir)
+        if entry.is_dir() and not entry.name.startswith(('_', '.'))
+    )
+
+
+def _manifests_signature(plugin_dirs: List[Path]) -> Tuple:
+    """Firma (nombre, mtime, tamaño) de los manifest.yaml de los plugins."""
+    signature = []
+    for plugin_dir in plugin_dirs:
+        try:
+            stat = (plugin_dir / "manifest.yaml").stat()
+            signature.append((plugin_dir.name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((plugin_dir.name, None, None))
+    return tuple(signature)
+
+
+def _build_manifest_index(reports_dir: Path, reports_mtime_ns: int,
+                          plugin_dirs: List[Path], signature: Tuple) -> _ManifestIndex:
+    """Carga los manifests de todos los plugins y construye el índice."""
+    manifests = []
+    dirs = {}
+
+    for plugin_dir in plugin_dirs:
+        # Intentar cargar manifest
+        manifest = load_manifest(plugin_dir)
+        if manifest:
+            manifests.append(manifest)
+            dirs[manifest.id] = plugin_dir
+            logger.info(f"Plugin encontrado: {manifest.nombre} (ID: {manifest.id})")
+
+    logger.info(f"Total de plugins disponibles: {len(manifests)}")
+    return _ManifestIndex(reports_mtime_ns, signature, manifests, dirs)
+
+
+def _get_manifest_index() -> Optional[_ManifestIndex]:
+    """
+    Devuelve el índice de manifests, reconstruyéndolo solo si ha cambiado.
+
+    Returns:
+        Índice de manifests o None si no existe el directorio reports/
+    """
+    global _manifest_index
+
+    index = _manifest_index
+    if index is not None and time.monotonic() - index.checked_at < MANIFEST_INDEX_TTL:
+        return index
+
+    reports_dir = get_reports_dir()
+
+    with _manifest_index_lock:
+        try:
+            reports_mtime_ns = reports_dir.stat().st_mtime_ns
+        except OSError:
+            logger.error(f"Directorio de reports no encontrado: {reports_dir}")
+            _manifest_index = None
+            return None
+
+        index = _manifest_index
+        if index is not None and index.reports_mtime_ns == reports_mtime_ns:
+            # Mismo listado de directorios: basta con revisar los manifests
+            plugin_dirs = [reports_dir / name for name, _, _ in index.signature]
+        else:
+            plugin_dirs = _list_plugin_dirs(reports_dir)
+
+        signature = _manifests_signature(plugin_dirs)
+
+        if index is not None and index.reports_mtime_ns == reports_mtime_ns \
+                and index.signature == signature:
+            index.checked_at = time.monotonic()
+            return index
+
+        _manifest_index = _build_manifest_index(reports_dir, reports_mtime_ns,
+                                                plugin_dirs, signature)
+        return _manifest_index
+
+
+def invalidate_manifest_index() -> None:
+    """Fuerza a reconstruir el índice de manifests en la siguiente consulta."""
+    global _manifest_index
+    with _manifest_index_lock:
+        _manifest_index = None
+
+
 def list_available_reports() -> List[Manifest]:
     """
-    Escanea el directorio reports/ y devuelve la lista de plugins disponibles.
+    Devuelve la lista de plugins disponibles en el directorio reports/.
     
     Returns:
         Lista de Manifests de plugins válidos
     """
-    reports_dir = get_reports_dir()
+    index = _get_manifest_index()
+    return list(index.manifests) if index else []
+
+
+def get_report_manifest(report_id: str) -> Optional[Manifest]:
+    """
+    Obtiene el manifest de un plugin por su id.
     
-    if not reports_dir.exists():
-        logger.error(f"Directorio de reports no encontrado: {reports_dir}")
-        return []
+    Args:
+        report_id: ID del plugin
     
-    plugins = []
+    Returns:
+        Manifest o None si no existe
+    """
+    index = _get_manifest_index()
+    return index.by_id.get(report_id) if index else None
+
+
+def get_plugin_dir(report_id: str) -> Optional[Path]:
+    """
+    Obtiene el directorio de un plugin por su id.
     
-    # Escanear subdirectorios
-    for plugin_dir in reports_dir.iterdir():
-        if not plugin_dir.is_dir():
-            continue
-        
-        # Ignorar directorios que empiezan con _ o .
-        if plugin_dir.name.startswith('_') or plugin_dir.name.startswith('.'):
-            continue
-        
-        # Intentar cargar manifest
-        manifest = load_manifest(plugin_dir)
-        if manifest:
-            plugins.append(manifest)
-            logger.info(f"Plugin encontrado: {manifest.nombre} (ID: {manifest.id})")
+    Args:
+        report_id: ID del plugin (manifest.id)
     
-    logger.info(f"Total de plugins disponibles: {len(plugins)}")
-    return plugins
+    Returns:
+        Path al directorio del plugin o None si no existe
+    """
+    index = _get_manifest_index()
+    return index.dirs.get(report_id) if index else None
 
 
 # ==============================================================================
@@ -68,8 +191,8 @@ def load_report_plugin(report_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Diccionario con toda la configuración del plugin o None si no se encuentra
     """
-    reports_dir = get_reports_dir()
-    plugin_dir = reports_dir / report_id
+    # Búsqueda por id en el índice; si no está, el id es el nombre del directorio
+    plugin_dir = get_plugin_dir(report_id) or get_reports_dir() / report_id
     
     if not plugin_dir.exists():
         logger.error(f"Plugin no encontrado: {report_id}")
@@ -82,6 +205,12 @@ def load_report_plugin(report_id: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Error cargando configuración de plugin: {report_id}")
         return None
     
+    # Tablas de verdad precompiladas de los bloques (opcionales)
+    try:
+        load_truth_tables(plugin_dir, config['config_dir'])
+    except Exception as e:
+        logger.warning(f"No se pudieron cargar las tablas de verdad de {report_id}: {e}")
+    
     # Cargar el módulo logic.py del plugin
     try:
         logic_module = import_plugin_logic(plugin_dir)
@@ -97,12 +226,22 @@ def load_report_plugin(report_id: str) -> Optional[Dict[str, Any]]:
 # IMPORTACIÓN DINÁMICA DE LÓGICA
 # ==============================================================================
 
-def import_plugin_logic(plugin_dir: Path) -> Any:
+# logic.py resuelto -> (mtime_ns, tamaño, módulo)
+_logic_modules: Dict[Path, Tuple[int, int, Any]] = {}
+_logic_modules_lock = threading.Lock()
+
+
+def import_plugin_logic(plugin_dir: Path, reload: bool = False) -> Any:
     """
     Importa dinámicamente el módulo logic.py de un plugin.
     
+    Cada logic.py se ejecuta como mucho una vez por versión del archivo
+    (mtime y tamaño): las llamadas posteriores, desde cualquier sesión,
+    devuelven el mismo módulo. Si el archivo cambia se vuelve a importar.
+    
     Args:
         plugin_dir: Directorio del plugin
+        reload: Si es True, vuelve a ejecutar el módulo aunque no haya cambiado
     
     Returns:
         Módulo importado
@@ -115,23 +254,61 @@ def import_plugin_logic(plugin_dir: Path) -> Any:
     if not logic_path.exists():
         raise FileNotFoundError(f"No se encontró logic.py en {plugin_dir}")
     
-    # Crear spec del módulo
-    spec = importlib.util.spec_from_file_location(
-        f"plugin_{plugin_dir.name}_logic", 
-        logic_path
-    )
+    key = logic_path.resolve()
+    stat = logic_path.stat()
     
-    if spec is None or spec.loader is None:
-        raise ImportError(f"No se pudo crear spec para {logic_path}")
+    cached = _logic_modules.get(key)
+    if not reload and cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
     
-    # Cargar módulo
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[spec.name] = module
-    spec.loader.exec_module(module)
+    with _logic_modules_lock:
+        # Otra sesión pudo importarlo mientras se esperaba el lock
+        cached = _logic_modules.get(key)
+        if not reload and cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        
+        # Crear spec del módulo
+        spec = importlib.util.spec_from_file_location(
+            f"plugin_{plugin_dir.name}_logic", 
+            logic_path
+        )
+        
+        if spec is None or spec.loader is None:
+            raise ImportError(f"No se pudo crear spec para {logic_path}")
+        
+        # Cargar módulo
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            # No dejar un módulo a medio ejecutar registrado
+            if cached:
+                sys.modules[spec.name] = cached[2]
+            else:
+                sys.modules.pop(spec.name, None)
+            raise
+        
+        _logic_modules[key] = (stat.st_mtime_ns, stat.st_size, module)
     
+    logger.info(f"Módulo de lógica importado: {logic_path}")
     return module
 
 
+def reload_plugin_logic(report_id: str) -> Any:
+    """
+    Vuelve a importar el logic.py de un plugin (recarga en caliente).
+    
+    Args:
+        report_id: ID del plugin
+    
+    Returns:
+        Módulo recién importado
+    """
+    plugin_dir = get_plugin_dir(report_id) or get_reports_dir() / report_id
+    return import_plugin_logic(plugin_dir, reload=True)
+
+
 # ==============================================================================
 # OBTENCIÓN DE FUNCIÓN BUILD_CONTEXT
 # ==============================================================================
@@ -157,6 +334,29 @@ def get_build_context_function(plugin_config: Dict[str, Any]):
     return logic_module.build_context
 
 
+def create_context_builder(plugin_config: Dict[str, Any]) -> Optional[Any]:
+    """
+    Crea un constructor de contexto incremental si el plugin lo ofrece.
+    
+    Los plugins pueden exportar en logic.py una clase
+    ``IncrementalContextBuilder(config_dir)`` con un método ``build(data_in)``
+    equivalente a ``build_context``.
+    
+    Args:
+        plugin_config: Configuración cargada del plugin
+    
+    Returns:
+        Instancia del constructor o None si el plugin no lo soporta
+    """
+    logic_module = plugin_config.get('logic_module')
+    builder_class = getattr(logic_module, 'IncrementalContextBuilder', None)
+    
+    if builder_class is None:
+        return None
+    
+    return builder_class(plugin_config['config_dir'])
+
+
 # ==============================================================================
 # OBTENCIÓN DE PATH DE PLANTILLA
 # ==============================================================================